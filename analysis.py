@@ -1,9 +1,13 @@
 # pages/analysis.py
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
+from utils.calculations import evaluate_scenarios, simulate_losses
+from utils.charts import financial_impact_chart, loss_distribution_chart, adjusted_impact_chart
+from utils.figures import cached_figure, source_versions
 from utils.helpers import load_csv, add_header, add_footer, calculate_financial_impact, SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR
+from utils.watcher import watch_datasets
 
 def display_climate_risk():
     """
@@ -16,7 +20,9 @@ def display_climate_risk():
     st.header("Climate Risk Assessment")
     
     # Load risk data
+    sources = source_versions("data/risk_data.csv")
     risk_df = load_csv("data/risk_data.csv")
+    watch_datasets("data/risk_data.csv")
     
     if not risk_df.empty:
         # Calculate financial impact
@@ -38,14 +44,7 @@ def display_climate_risk():
         
         # Visualization: Financial Impact by Risk Subcategory
         st.subheader("Financial Impact by Risk Subcategory")
-        fig = px.bar(
-            risk_df, 
-            x='Subcategory', 
-            y='Financial_Impact',
-            color='Risk_Category',
-            title='Financial Impact by Risk Subcategory',
-            labels={'Financial_Impact': 'Financial Impact (USD)'}
-        )
+        fig = cached_figure(financial_impact_chart, risk_df, sources=sources)
         st.plotly_chart(fig, use_container_width=True)
         
         # Total Financial Impact
@@ -55,36 +54,60 @@ def display_climate_risk():
         # Display Total Financial Impact
         st.write(f"**Total Financial Impact:** ${total_impact:,.2f}")
         
-        # Interactive Slider: Adjust Severity of Each Risk
+        # Monte Carlo: loss distribution instead of only the expected value
+        st.subheader("Simulated Loss Distribution")
+        col1, col2, col3 = st.columns(3)
+        draws = col1.number_input("Simulated years", min_value=10_000, max_value=5_000_000, value=1_000_000, step=100_000)
+        seed = col2.number_input("Random seed", min_value=0, value=42, step=1)
+        severity_sigma = col3.slider("Severity volatility (lognormal sigma)", 0.0, 2.0, 0.5, 0.1)
+        simulation = simulate_losses(risk_df, draws=int(draws), seed=int(seed), severity_sigma=severity_sigma)
+        st.dataframe(simulation.summary.style.format("${:,.0f}"))
+        if simulation.draws < draws:
+            st.info(
+                f"Stopped after {simulation.draws:,} of {int(draws):,} simulated years to stay within the time budget; "
+                "the same seed always gives these results for this many years."
+            )
+        else:
+            st.caption(f"{simulation.draws:,} simulated years in {simulation.elapsed:.1f}s.")
+        counts, edges = simulation.histogram
+        fig_losses = cached_figure(loss_distribution_chart, counts, edges)
+        st.plotly_chart(fig_losses, use_container_width=True)
+        
+        # Bulk what-if: one editable grid plus a multiplier per Risk_Category
         st.subheader("Adjust Risk Severity to Explore Financial Impact")
-        adjusted_severity = risk_df.copy()
-        for index, row in adjusted_severity.iterrows():
-            adjusted_severity.at[index, 'Severity'] = st.slider(
-                label=f"Adjust Severity for {row['Subcategory']}",
-                min_value=0,
-                max_value=int(row['Severity'] * 2),  # Allow up to double the severity
-                value=int(row['Severity']),
-                step=100000,
-                key=f"severity_slider_{index}"
+        categories = sorted(risk_df['Risk_Category'].dropna().astype(str).unique())
+        multiplier_columns = st.columns(max(len(categories), 1))
+        multipliers = {
+            category: column.number_input(
+                f"{category} severity multiplier",
+                min_value=0.0, max_value=10.0, value=1.0, step=0.05,
+                key=f"severity_multiplier_{category}"
             )
+            for category, column in zip(categories, multiplier_columns)
+        }
+        edited = st.data_editor(
+            risk_df[['Risk_Category', 'Subcategory', 'Probability', 'Severity']],
+            disabled=['Risk_Category', 'Subcategory', 'Probability'],
+            column_config={'Severity': st.column_config.NumberColumn('Severity (USD)', min_value=0, step=100000)},
+            hide_index=True,
+            use_container_width=True,
+            key="severity_editor"
+        )
+        factors = risk_df['Risk_Category'].astype(str).map(multipliers).fillna(1.0).to_numpy()
+        severities = edited['Severity'].to_numpy(dtype=float, na_value=np.nan) * factors
         
-        # Recalculate Financial Impact based on adjusted severity
-        adjusted_severity['Financial_Impact'] = adjusted_severity['Probability'] * adjusted_severity['Severity']
-        adjusted_total_impact = adjusted_severity['Financial_Impact'].sum()
+        # One vectorized pass over the register with the edited severities
+        results = evaluate_scenarios(risk_df, severities=severities, scenario_names=["Adjusted"])
+        adjusted_severity = risk_df.assign(Severity=severities, Financial_Impact=results.impacts[0])
+        adjusted_total_impact = results.totals[0]
         
         # Display Adjusted Total Financial Impact
         st.write(f"**Adjusted Total Financial Impact:** ${adjusted_total_impact:,.2f}")
+        st.dataframe(results.by_category.style.format("${:,.2f}"))
         
         # Visualization: Adjusted Financial Impact
         st.subheader("Adjusted Financial Impact by Risk Subcategory")
-        fig_adjusted = px.bar(
-            adjusted_severity, 
-            x='Subcategory', 
-            y='Financial_Impact',
-            color='Risk_Category',
-            title='Adjusted Financial Impact by Risk Subcategory',
-            labels={'Financial_Impact': 'Financial Impact (USD)'}
-        )
+        fig_adjusted = cached_figure(adjusted_impact_chart, adjusted_severity)
         st.plotly_chart(fig_adjusted, use_container_width=True)
         
         # Download Adjusted Risk Data
@@ -2,10 +2,15 @@ import streamlit as st
 from PIL import Image
 import importlib
 import os
+from utils.report import build_report
+from utils.watcher import start_watcher
 
 # Set page configuration
 st.set_page_config(page_title="Bank Leumi Environmental Tool", layout="wide")
 
+# Reload changed data files in the background, once for all sessions
+start_watcher()
+
 # Load logos
 col1, col2 = st.columns([1, 1])
 with col1:
@@ -69,10 +74,14 @@ elif page == "Task Tracker":
     task_tracker = importlib.import_module("pages.task_tracker")
     task_tracker.display_task_tracker_page()
 
-# Print Instructions
+# Report Export
 st.sidebar.markdown("---")
-st.sidebar.header("Print Dashboard")
-st.sidebar.info(
-    "To print the dashboard, use your browser's print functionality. "
-    "Press `Ctrl + P` (Windows) or `Cmd + P` (Mac) and select the desired print options."
-)
\ No newline at end of file
+st.sidebar.header("Export Report")
+st.sidebar.download_button(
+    label="Download Full Report (ZIP)",
+    data=build_report,  # built only when clicked
+    file_name="esg_report.zip",
+    mime="application/zip",
+    key="download_full_report"
+)
+st.sidebar.caption("Every page's tables and charts; open report.html in the archive to print it.")
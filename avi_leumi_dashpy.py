@@ -4,6 +4,8 @@ import plotly.express as px
 import numpy as np
 import os
 
+from leumi_datasets import get_compliance_summary, get_dataset
+
 # --- Debug prints to verify logo file existence ---
 print(os.path.exists("/Users/aviluvchik/z_CLEARAPP/BankLeumi/bank_leumi_tool/assets/oporto_logo.png"))
 print(os.path.exists("/Users/aviluvchik/z_CLEARAPP/BankLeumi/bank_leumi_tool/assets/client_logo.png"))
@@ -110,43 +112,7 @@ elif page == "Portfolio Carbon Analysis":
 
     # 2.1 Detailed Emissions Table
     st.header("Detailed Emissions Overview")
-    emissions_data = pd.DataFrame({
-        "Scope": [
-            "Scope 1", "Scope 1", "Scope 2", "Scope 2", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3",
-            "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3",
-            "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3"
-        ],
-        "Category": [
-            "Direct Emissions - Office Energy Use", "Direct Emissions - Company Vehicles",
-            "Indirect Energy Emissions - Purchased Electricity", "Indirect Energy Emissions - Cooling Systems",
-            "Financed Emissions - Corporate Loans", "Financed Emissions - Investments", "Business Travel",
-            "Supply Chain Emissions", "Data Centers", "Waste Management", "Office Supplies", "Outsourced Services",
-            "IT Equipment", "Marketing Activities", "Logistics Services", "Capital Goods", "Professional Services",
-            "Training Programs", "Food Services", "Printing Services", "Telecommunications", "Insurance Services",
-            "Legal Services", "Banking Services", "Cleaning Services", "Temporary Staffing"
-        ],
-        "Emissions 2024 (tons CO₂)": [
-            3049, 2542, 1698, 3958, 1975, 3799, 2892, 3956, 3294, 2239,
-            4523, 3783, 556, 1688, 4327, 2853, 1442, 4102, 3541, 3150,
-            3449, 4282, 4126, 1486, 2226, 3601
-        ],
-        "Target 2030 (tons CO₂)": [
-            1328, 670, 729, 855, 1224, 1965, 1105, 1542, 1186, 1206,
-            2320, 1550, 259, 949, 2316, 1362, 857, 1935, 1038, 747,
-            207, 79, 819, 1068, 1458, 2746
-        ],
-        "% of Target": [
-            0.5644, 0.7364, 0.5707, 0.7840, 0.3803, 0.4828, 0.6179, 0.6102, 0.6400, 0.4614,
-            0.4871, 0.5903, 0.5342, 0.4378, 0.4648, 0.5226, 0.4057, 0.5283, 0.7069, 0.7629,
-            0.9400, 0.9820, 0.8015, 0.2813, 0.3450, 0.2374
-        ],
-        "Owner": [
-            "Finance", "Legal", "Finance", "Legal", "IT Department", "HR", "Legal", "Finance", "HR", "Finance",
-            "Legal", "HR", "HR", "Sustainability Team", "Sustainability Team", "Operations", "Sustainability Team",
-            "IT Department", "Sustainability Team", "Operations", "Sustainability Team", "HR", "Sustainability Team",
-            "Operations", "Sustainability Team", "Finance"
-        ]
-    })
+    emissions_data = get_dataset("emissions")
     st.dataframe(emissions_data)
 
     # 2.2 Comparison to Targets
@@ -164,29 +130,7 @@ elif page == "Portfolio Carbon Analysis":
 
     # 2.3 Path to Net Zero
     st.header("Path to Net Zero")
-    tasks = pd.DataFrame({
-        "Task": [
-            "Achieve zero deforestation in financed projects",
-            "Engage 80% of staff in sustainability training",
-            "Transition all data centers to renewable energy",
-            "Expand green financing portfolio by 40%",
-            "Implement supplier ESG audits for top 50 suppliers",
-            "Achieve 25% waste reduction in operations",
-            "Conduct water usage audits and reduce consumption by 20%",
-            "Achieve 100% digital communication and reduce printing by 90%",
-            "Replace 60% of company vehicles with electric vehicles",
-            "Increase renewable energy usage to 50%",
-            "Implement circular economy practices in office operations",
-            "Offset 100% of unavoidable emissions through verified carbon offsets",
-            "Retrofit all office buildings for energy efficiency"
-        ],
-        "Deadline": pd.date_range(start="2023-01-01", periods=13, freq="2A").strftime("%Y-%m-%d"),
-        "Completion (%)": [20, 45, 15, 35, 50, 30, 25, 80, 10, 40, 20, 5, 15],
-        "Owner": [
-            "Finance", "HR", "IT Department", "Sustainability Team", "Operations", "Sustainability Team", "Finance",
-            "IT Department", "Operations", "Sustainability Team", "HR", "Legal", "Sustainability Team"
-        ]
-    })
+    tasks = get_dataset("net_zero_tasks")
 
     st.subheader("Tasks Supporting the Path to Net Zero")
     st.dataframe(tasks)
@@ -250,66 +194,19 @@ elif page == "Compliance & Regulatory":
 
     # --- 3.1 Regulatory Compliance Overview ---
     st.header("Regulatory Compliance")
-    compliance_data = pd.DataFrame({
-        "Regulation": [
-            "Proper Conduct of Banking Business Directive 345",
-            "Net Zero 2050 (NGFS Scenarios)",
-            "EU Green Taxonomy",
-            "Corporate Sustainability Reporting Directive (CSRD)",
-            "Task Force on Climate-related Financial Disclosures (TCFD)",
-            "Israeli Securities Authority ESG Reporting"
-        ],
-        "Requirement": [
-            "Climate risk disclosures and portfolio analysis",
-            "Alignment with international climate targets",
-            "Classification of green finance activities",
-            "Mandatory sustainability reporting",
-            "Risk assessment for climate change impacts",
-            "Disclosure of ESG-related activities and goals"
-        ],
-        "Status": ["In Progress", "Completed", "In Progress", "Not Started", "Completed", "In Progress"],
-        "Deadline": ["2025-12-31", "2023-12-31", "2024-06-30", "2025-12-31", "2023-12-31", "2024-12-31"],
-        "Owner": ["Risk Management", "Sustainability Team", "Finance", "Legal", "Sustainability Team", "Legal"]
-    })
+    compliance_data = get_dataset("compliance")
     st.dataframe(compliance_data)
 
     # --- 3.2 Beyond Compliance Initiatives ---
     st.header("Beyond Compliance Initiatives")
-    beyond_compliance_data = pd.DataFrame({
-        "Initiative": [
-            "Allocate NIS 35 billion to green financing by 2030",
-            "Reduce operational emissions by 20% by 2030",
-            "Achieve 100% digital communication by 2024",
-            "Transition all data centers to renewable energy by 2035",
-            "Retrofit office buildings for energy efficiency by 2028",
-            "Offset 100% of unavoidable emissions by 2040",
-            "Sustainability-linked loans totaling NIS 1.48 billion",
-            "Facilitate ESG-focused investment products"
-        ],
-        "Target Year": [2030, 2030, 2024, 2035, 2028, 2040, 2023, 2023],
-        "Completion (%)": [45, 20, 80, 15, 25, 5, 100, 100],
-        "Owner": [
-            "Finance", "Sustainability Team", "IT Department", "IT Department",
-            "Operations", "Legal", "Finance", "Finance"
-        ]
-    })
+    beyond_compliance_data = get_dataset("beyond_compliance")
     st.dataframe(beyond_compliance_data)
 
     # --- 3.3 Radar/Pentagon Chart: Bank vs International Regulation ---
     st.header("Bank vs. International Regulatory Alignment (Radar Chart)")
     st.write("Visualize Bank Leumi’s alignment scores across multiple regulations/frameworks in a pentagon-style chart.")
 
-    radar_df = pd.DataFrame({
-        "Guideline": [
-            "TCFD", 
-            "EU Green Taxonomy", 
-            "CSRD", 
-            "IFRS S2", 
-            "Net Zero 2050"
-        ],
-        "Bank Leumi (%)": [85, 70, 65, 75, 80],
-        "International Best Practice (%)": [90, 85, 80, 85, 90],
-    })
+    radar_df = get_dataset("regulatory_alignment")
     # Melt the data for Plotly
     radar_melted = radar_df.melt(
         id_vars=["Guideline"], 
@@ -336,18 +233,7 @@ elif page == "Compliance & Regulatory":
 
     # --- 1. KPI Data ---
     st.header("Key Performance Indicators (KPIs)")
-    kpi_data = pd.DataFrame({
-        "KPI": [
-            "Carbon Intensity (kg CO₂e / million NIS assets)", 
-            "Green Financing Volume (NIS billions)",
-            "Renewable Energy in Operations (%)",
-            "Female Representation in Management (%)",
-            "Supplier ESG Compliance Rate (%)"
-        ],
-        "Current Value": [320, 18, 25, 40, 60],
-        "2025 Target": [250, 25, 40, 45, 75],
-        "2030 Target": [150, 40, 80, 50, 90]
-    })
+    kpi_data = get_dataset("esg_kpis")
     st.table(kpi_data)
 
     # --- 2. KPI Progress Visualization ---
@@ -371,14 +257,7 @@ elif page == "Compliance & Regulatory":
     # --- 3. KPI Trend Over Time ---
     st.header("KPI Trend Over Time")
     # Example trend data (for illustrative purposes)
-    trend_data = pd.DataFrame({
-        "Year": [2020, 2021, 2022, 2023, 2024, 2025, 2030],
-        "Carbon Intensity (kg CO₂e / million NIS assets)": [400, 350, 330, 320, 300, 250, 150],
-        "Green Financing Volume (NIS billions)": [10, 12, 15, 16, 18, 25, 40],
-        "Renewable Energy in Operations (%)": [10, 15, 18, 20, 25, 40, 80],
-        "Female Representation in Management (%)": [30, 35, 38, 40, 42, 45, 50],
-        "Supplier ESG Compliance Rate (%)": [50, 55, 58, 60, 65, 75, 90]
-    })
+    trend_data = get_dataset("kpi_trend")
     
     # Plotly Line Chart
     trend_chart = px.line(
@@ -399,13 +278,7 @@ elif page == "Compliance & Regulatory":
 
     # --- 3.4 Climate Risk Overview ---
     st.header("Climate Risk Overview and Comparison")
-    risks_comparison_data = pd.DataFrame({
-        "Risk Type": ["Physical", "Transition", "Liability"],
-        "Bank Leumi Score": [75, 65, 50],
-        "EU Benchmark": [80, 70, 60],
-        "ECB Compliance (%)": [85, 75, 65],
-        "Alignment with TCFD (%)": [90, 80, 70]
-    })
+    risks_comparison_data = get_dataset("climate_risk_comparison")
     st.write("Comparison of Bank Leumi’s climate risk scores to international benchmarks:")
     st.dataframe(risks_comparison_data, use_container_width=True)
 
@@ -422,30 +295,7 @@ elif page == "Compliance & Regulatory":
     st.plotly_chart(comparison_chart)
 
     # --- Define task_tracker before using it ---
-    task_tracker = pd.DataFrame({
-        "Task": [
-            "Conduct climate scenario analysis for credit portfolio",
-            "Implement flood and heat risk assessments for real estate collateral",
-            "Develop ESG-focused investment products",
-            "Expand sustainability-linked loans by 10% annually",
-            "Increase procurement of renewable energy for operations",
-            "Complete office energy retrofitting by 2028",
-            "Enhance ESG reporting transparency by 2024",
-            "Introduce climate risk mitigation training for staff"
-        ],
-        "Deadline": [
-            "2024-06-30", "2025-12-31", "2023-12-31", "2024-12-31",
-            "2025-12-31", "2028-12-31", "2024-12-31", "2023-12-31"
-        ],
-        "Status": [
-            "In Progress", "Not Started", "Completed", "In Progress",
-            "In Progress", "Not Started", "In Progress", "Completed"
-        ],
-        "Owner": [
-            "Risk Management", "Risk Management", "Finance", "Finance",
-            "Operations", "Operations", "Sustainability Team", "HR"
-        ]
-    })
+    task_tracker = get_dataset("compliance_tasks")
 
     # Gantt Chart for tasks
     gantt_chart = px.scatter(
@@ -481,22 +331,7 @@ elif page == "Compliance & Regulatory":
 
     # 3.5 Overall Compliance Progress
     st.header("Overall Compliance Progress")
-    compliance_summary = pd.DataFrame({
-        "Track": ["Regulatory Compliance", "Beyond Compliance Initiatives"],
-        "Total Tasks": [len(compliance_data), len(beyond_compliance_data)],
-        "Completed": [
-            compliance_data["Status"].value_counts().get("Completed", 0),
-            beyond_compliance_data["Completion (%)"].apply(lambda x: 100 if x == 100 else 0).sum()
-        ],
-        "In Progress": [
-            compliance_data["Status"].value_counts().get("In Progress", 0),
-            beyond_compliance_data["Completion (%)"].apply(lambda x: 1 if 0 < x < 100 else 0).sum()
-        ],
-        "Not Started": [
-            compliance_data["Status"].value_counts().get("Not Started", 0),
-            beyond_compliance_data["Completion (%)"].apply(lambda x: 1 if x == 0 else 0).sum()
-        ]
-    })
+    compliance_summary = get_compliance_summary()
     st.dataframe(compliance_summary)
 
     display_footer()
@@ -524,12 +359,7 @@ elif page == "Financial Analysis":
 
     # 4.2 CAPEX vs. OPEX for Key ESG Projects
     st.header("Capital & Operating Expenditure (CAPEX/OPEX) for ESG Projects")
-    projects_data = pd.DataFrame({
-        "Project": ["Office Retrofit", "EV Fleet Transition", "Renewable Data Centers"],
-        "CAPEX (NIS millions)": [35, 50, 75],
-        "Annual OPEX Savings (NIS millions)": [5, 8, 15],
-        "Payback (Years)": [7, 6, 5]
-    })
+    projects_data = get_dataset("esg_projects")
     st.dataframe(projects_data)
 
     # Simple bar chart to visualize CAPEX
@@ -549,11 +379,7 @@ elif page == "Financial Analysis":
         "Adapt this to real data for precise analysis."
     )
     # We'll just show them as made-up values
-    roi_data = pd.DataFrame({
-        "Project": ["Office Retrofit", "EV Fleet Transition", "Renewable Data Centers"],
-        "ROI (%)": [12, 15, 20],
-        "NPV (NIS millions)": [10, 15, 30]
-    })
+    roi_data = get_dataset("project_returns")
     st.table(roi_data)
 
     display_footer()
@@ -578,18 +404,7 @@ elif page == "Decision Support Tools":
         "Below is a snapshot of crucial ESG metrics aligned with Bank Leumi’s strategy "
         "and global benchmarks (TCFD, SASB, IFRS S2)."
     )
-    kpi_data = pd.DataFrame({
-        "KPI": [
-            "Carbon Intensity (kg CO₂e / million NIS assets)", 
-            "Green Financing Volume (NIS billions)",
-            "Renewable Energy in Operations (%)",
-            "Female Representation in Management (%)",
-            "Supplier ESG Compliance Rate (%)"
-        ],
-        "Current Value": [320, 18, 25, 40, 60],
-        "2025 Target": [250, 25, 40, 45, 75],
-        "2030 Target": [150, 40, 80, 50, 90]
-    })
+    kpi_data = get_dataset("esg_kpis")
     st.table(kpi_data)
     
     # 5.2 Scenario Modeling Example
@@ -620,21 +435,7 @@ elif page == "Decision Support Tools":
         recommended stakeholders and potential roles.
         """
     )
-    stakeholders = pd.DataFrame({
-        "Stakeholder": [
-            "Risk Management", "Finance", "HR", "IT Department", 
-            "Operations", "Regulators", "NGOs/Civil Society"
-        ],
-        "Role": [
-            "Evaluate and integrate climate risks into credit decisions",
-            "Structure green financing instruments, measure ROI of ESG",
-            "Oversee employee engagement/training on ESG topics",
-            "Implement technology solutions for ESG data and monitoring",
-            "Optimize resource use (energy, water, waste) in daily operations",
-            "Provide regulatory guidelines and oversight on ESG disclosures",
-            "Offer independent insights on community/environmental needs"
-        ]
-    })
+    stakeholders = get_dataset("stakeholders")
     st.table(stakeholders)
     
     # 5.4 Recommended Actions (Best Practices from Global Banks)
@@ -1,15 +1,187 @@
 # utils/calculations.py
 
+from dataclasses import dataclass
+import hashlib
+import threading
+import time
+
+import numpy as np
 import pandas as pd
 
+@dataclass(frozen=True)
+class ScenarioImpacts:
+    """
+    Financial impact of a batch of what-if scenarios over the same risks.
+
+    impacts is a (scenarios x risks) array, totals holds one sum per scenario
+    and by_category is a scenarios x Risk_Category DataFrame of subtotals.
+    """
+    impacts: np.ndarray
+    totals: np.ndarray
+    by_category: pd.DataFrame
+
+def _scenario_matrix(values, default, name):
+    """
+    Broadcasts per-risk values to a float (scenarios x risks) matrix. A single
+    vector is one scenario; None falls back to the risks' own column.
+    """
+    matrix = np.atleast_2d(np.asarray(default if values is None else values, dtype=float))
+    if matrix.ndim != 2 or matrix.shape[1] != len(default):
+        raise ValueError(f"{name} must have one column per risk ({len(default)}), got shape {matrix.shape}")
+    return matrix
+
+def _category_membership(risk_df):
+    """
+    Returns a one-hot (risks x categories) matrix of Risk_Category and the
+    sorted category labels. Rows without a category belong to none.
+    """
+    if 'Risk_Category' in risk_df.columns:
+        codes, categories = pd.factorize(risk_df['Risk_Category'], sort=True)
+    else:
+        codes, categories = np.full(len(risk_df), -1), pd.Index([])
+    membership = np.zeros((len(codes), len(categories)))
+    valid = codes >= 0
+    membership[np.flatnonzero(valid), codes[valid]] = 1.0
+    return membership, categories.astype(object)
+
+def evaluate_scenarios(risk_df, severities=None, probabilities=None, scenario_names=None):
+    """
+    Evaluates Probability x Severity for many scenarios in one NumPy pass.
+
+    severities and probabilities are arrays of shape (risks,) or
+    (scenarios, risks), aligned with the rows of risk_df; whichever is left
+    out is taken from risk_df. Missing values count as zero impact.
+    """
+    base_probability = risk_df['Probability'].to_numpy(dtype=float, na_value=np.nan)
+    base_severity = risk_df['Severity'].to_numpy(dtype=float, na_value=np.nan)
+    probability = _scenario_matrix(probabilities, base_probability, "probabilities")
+    severity = _scenario_matrix(severities, base_severity, "severities")
+
+    impacts = np.nan_to_num(probability * severity)
+    totals = impacts.sum(axis=1)
+
+    # Per-category subtotals are a single matrix product instead of a groupby per scenario
+    membership, categories = _category_membership(risk_df)
+    by_category = pd.DataFrame(
+        impacts @ membership,
+        index=pd.Index(scenario_names if scenario_names is not None else range(len(totals)), name="Scenario"),
+        columns=pd.Index(categories, name="Risk_Category"),
+    )
+    return ScenarioImpacts(impacts=impacts, totals=totals, by_category=by_category)
+
+@dataclass(frozen=True)
+class LossSimulation:
+    """
+    Simulated annual loss distribution of the risks in risk_data.csv.
+
+    summary has one row per Risk_Category plus "Total", with the expected
+    loss and the VaR and expected shortfall at each confidence level.
+    histogram is (counts, bin_edges) of the total loss.
+    """
+    summary: pd.DataFrame
+    histogram: tuple
+    draws: int
+    elapsed: float
+
+# Simulations already run in this process, keyed by a hash of their inputs
+_SIMULATION_CACHE = {}
+_simulation_lock = threading.Lock()
+
+# Random numbers drawn per chunk, so memory stays flat however many risks there are
+_CHUNK_ELEMENTS = 2_000_000
+
+def _simulation_key(risk_df, *params):
+    digest = hashlib.blake2b(digest_size=16)
+    columns = [c for c in ('Risk_Category', 'Probability', 'Severity') if c in risk_df.columns]
+    digest.update(pd.util.hash_pandas_object(risk_df[columns], index=False).to_numpy().tobytes())
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+def _tail_metrics(losses, levels):
+    """
+    Returns the expected loss and, for each level, VaR (the level quantile) and
+    expected shortfall of each column. ES is the mean of the worst
+    ceil((1 - level) * n) draws, so it stays in the tail even when many
+    draws tie at the VaR (e.g. zero for a rare risk).
+    """
+    n = len(losses)
+    metrics = {"Expected_Loss": losses.mean(axis=0)}
+    for level in levels:
+        worst = min(max(int(np.ceil((1 - level) * n)), 1), n)
+        label = f"{level:.0%}"
+        metrics[f"VaR {label}"] = np.quantile(losses, level, axis=0)
+        metrics[f"ES {label}"] = np.partition(losses, n - worst, axis=0)[n - worst:].mean(axis=0)
+    return metrics
+
+def simulate_losses(risk_df, draws=1_000_000, seed=42, severity_sigma=0.5,
+                    levels=(0.95, 0.99), time_budget=5.0):
+    """
+    Monte Carlo loss simulation for a risk register.
+
+    In every draw each risk occurs with its Probability (Bernoulli) and, if it
+    does, costs a lognormal amount whose mean is its Severity. Draws are
+    sampled in fixed-size chunks, each from its own generator seeded by
+    (seed, chunk number), and sampling stops once time_budget seconds have
+    passed (None for no limit). The first n draws are therefore always the same, so a run cut
+    short after n draws gives exactly the result of draws=n; the count used
+    is in the result's draws. Results are cached by input hash, under both
+    the requested and the effective draw count.
+    """
+    key = _simulation_key(risk_df, draws, seed, severity_sigma, tuple(levels), time_budget)
+    with _simulation_lock:
+        cached = _SIMULATION_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    probability = np.nan_to_num(risk_df['Probability'].to_numpy(dtype=float, na_value=np.nan))
+    severity = np.nan_to_num(risk_df['Severity'].to_numpy(dtype=float, na_value=np.nan))
+    membership, categories = _category_membership(risk_df)
+    # Lognormal location that keeps the mean severity at Severity
+    mu = np.log(np.maximum(severity, 1e-12)) - severity_sigma ** 2 / 2
+
+    # The chunk size depends only on the register, never on draws, so chunk
+    # boundaries (and their seeds) line up across runs
+    chunk = max(1, _CHUNK_ELEMENTS // max(len(risk_df), 1))
+    # The extra all-ones column sums every risk, with or without a category
+    weights = np.column_stack([membership, np.ones(len(risk_df))])
+    chunks = []
+    done = 0
+    while done < draws:
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(len(chunks),)))
+        n = min(chunk, draws - done)
+        occurred = rng.random((n, len(risk_df))) < probability
+        amounts = np.exp(mu + severity_sigma * rng.standard_normal((n, len(risk_df))))
+        chunks.append((occurred * amounts) @ weights)
+        done += n
+        if time_budget is not None and time.perf_counter() - started > time_budget:
+            break
+    losses = np.concatenate(chunks)
+    total_losses = losses[:, -1]
+
+    summary = pd.DataFrame(
+        _tail_metrics(losses, levels),
+        index=pd.Index(list(categories) + ["Total"], name="Risk_Category"),
+    )
+    result = LossSimulation(
+        summary=summary,
+        histogram=np.histogram(total_losses, bins=50),
+        draws=done,
+        elapsed=time.perf_counter() - started,
+    )
+    with _simulation_lock:
+        _SIMULATION_CACHE[key] = result
+        # The same draws, requested outright with no budget to cut them short
+        _SIMULATION_CACHE[_simulation_key(risk_df, done, seed, severity_sigma, tuple(levels), None)] = result
+    return result
+
 def calculate_financial_impact(df):
     """
     Calculate the financial impact based on probability and severity.
     Financial Impact = Probability * Severity
+    Returns a new frame with a Financial_Impact column; df is left untouched.
     """
     if 'Probability' in df.columns and 'Severity' in df.columns:
-        df['Financial_Impact'] = df['Probability'] * df['Severity']
-    else:
-        print("Required columns 'Probability' or 'Severity' not found in DataFrame.")
-        df['Financial_Impact'] = 0
-    return df
\ No newline at end of file
+        return df.assign(Financial_Impact=evaluate_scenarios(df).impacts[0])
+    print("Required columns 'Probability' or 'Severity' not found in DataFrame.")
+    return df.assign(Financial_Impact=0)
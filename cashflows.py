@@ -0,0 +1,125 @@
+# utils/cashflows.py
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# NIS per USD, used to value avoided tons at USD carbon prices
+USD_TO_NIS = 3.7
+
+# Years assumed for a project whose lifetime is missing, as in the report's MACC
+DEFAULT_LIFETIME = 10
+
+@dataclass(frozen=True)
+class PricePath:
+    """
+    A carbon price path: start price in USD per ton, growing by
+    annual_growth each year.
+    """
+    name: str
+    start: float
+    annual_growth: float = 0.0
+
+    def prices(self, years):
+        return self.start * (1 + self.annual_growth) ** np.arange(years)
+
+DEFAULT_PRICE_PATHS = (
+    PricePath("No carbon price", 0.0),
+    PricePath("Flat 50 USD/t", 50.0),
+    PricePath("50 USD/t rising 5%/yr", 50.0, 0.05),
+    PricePath("Net zero 2050 (100 USD/t rising 7%/yr)", 100.0, 0.07),
+)
+
+def project_cashflows(capex, savings, lifetime, tons, price_paths):
+    """
+    Returns the yearly cash inflows (projects x paths x years, year 1 first):
+    OPEX savings plus avoided tons valued at each path's carbon price, in
+    millions, and zero after each project's lifetime. Missing lifetimes
+    count as DEFAULT_LIFETIME years.
+    """
+    lifetime = np.asarray(lifetime, dtype=float)
+    lifetime = np.where(np.isfinite(lifetime), lifetime, DEFAULT_LIFETIME)
+    years = int(lifetime.max()) if len(lifetime) else 0
+    prices = np.array([path.prices(years) for path in price_paths]).reshape(len(price_paths), years)
+    carbon = np.asarray(tons, dtype=float)[:, None, None] * prices[None, :, :] * USD_TO_NIS / 1e6
+    inflows = np.asarray(savings, dtype=float)[:, None, None] + carbon
+    active = np.arange(years)[None, None, :] < lifetime[:, None, None]
+    return np.where(active, inflows, 0.0)
+
+def _npv(inflows, capex, rates):
+    """
+    NPV for every rate: inflows is (..., years), rates is (R,), result (..., R).
+    """
+    discount = (1 + rates[:, None]) ** -np.arange(1, inflows.shape[-1] + 1)[None, :]
+    return inflows @ discount.T - capex
+
+def _irr(inflows, capex, low=-0.99, high=10.0, iterations=80):
+    """
+    IRR by bisection on all projects and paths at once. NPV falls as the
+    rate rises for an upfront cost followed by inflows, so the root is
+    bracketed by low and high; NaN where it is not.
+    """
+    low = np.full(inflows.shape[:-1], low)
+    high = np.full(inflows.shape[:-1], high)
+    t = np.arange(1, inflows.shape[-1] + 1)
+
+    def npv(rate):
+        return (inflows / (1 + rate[..., None]) ** t).sum(axis=-1) - capex
+
+    bracketed = (npv(low) > 0) & (npv(high) < 0)
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        positive = npv(mid) > 0
+        low = np.where(positive, mid, low)
+        high = np.where(positive, high, mid)
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+def _discounted_payback(inflows, capex, rates):
+    """
+    Years until discounted inflows repay the CAPEX, interpolated within the
+    paying year; NaN if they never do within the lifetime.
+    """
+    t = np.arange(1, inflows.shape[-1] + 1)
+    discounted = inflows[..., None, :] / (1 + rates[:, None]) ** t  # (..., R, years)
+    cumulative = discounted.cumsum(axis=-1)
+    paid = cumulative >= capex[..., None, None]
+    year = paid.argmax(axis=-1)
+    before = np.take_along_axis(cumulative, np.maximum(year - 1, 0)[..., None], axis=-1)[..., 0]
+    before = np.where(year > 0, before, 0.0)
+    during = np.take_along_axis(discounted, year[..., None], axis=-1)[..., 0]
+    payback = year + (capex[..., None] - before) / np.where(during > 0, during, np.nan)
+    return np.where(paid.any(axis=-1), payback, np.nan)
+
+def evaluate_projects(projects_df, rates, price_paths=DEFAULT_PRICE_PATHS):
+    """
+    Computes NPV, IRR and discounted payback for every project x discount
+    rate x carbon price path in one set of array operations. Returns one row
+    per combination.
+
+    projects_df needs "CAPEX (NIS millions)", "Annual OPEX Savings (NIS
+    millions)", "Lifetime (Years)" and "Annual CO₂ Avoided (tons)".
+    """
+    rates = np.asarray(rates, dtype=float)
+    capex = projects_df["CAPEX (NIS millions)"].to_numpy(dtype=float)
+    inflows = project_cashflows(
+        capex,
+        projects_df["Annual OPEX Savings (NIS millions)"].to_numpy(dtype=float),
+        projects_df["Lifetime (Years)"].to_numpy(dtype=float),
+        projects_df["Annual CO₂ Avoided (tons)"].to_numpy(dtype=float),
+        price_paths,
+    )  # (projects, paths, years)
+
+    npv = _npv(inflows, capex[:, None, None], rates)  # (projects, paths, rates)
+    irr = _irr(inflows, capex[:, None])  # (projects, paths)
+    payback = _discounted_payback(inflows, capex[:, None], rates)  # (projects, paths, rates)
+
+    index = pd.MultiIndex.from_product(
+        [projects_df["Project"], [path.name for path in price_paths], rates],
+        names=["Project", "Carbon Price Path", "Discount Rate"],
+    )
+    return pd.DataFrame({
+        "NPV (NIS millions)": npv.ravel(),
+        "IRR (%)": np.repeat(irr.ravel() * 100, len(rates)),
+        "Discounted Payback (Years)": payback.ravel(),
+    }, index=index).reset_index()
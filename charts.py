@@ -0,0 +1,232 @@
+# utils/charts.py
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from utils.downsampling import fast_scatter
+from utils.geo_clusters import MAP_MARKER_LIMIT, get_geo_index
+from utils.helpers import ERROR_COLOR, PRIMARY_COLOR, SUCCESS_COLOR, WARNING_COLOR
+from utils.sweeps import run_sweep
+
+def tasks_by_department_chart(grouped):
+    return px.bar(
+        grouped,
+        x='Responsible',
+        y='Task Count',
+        title='Number of Tasks per Department',
+        labels={'Responsible': 'Department', 'Task Count': 'Number of Tasks'},
+        color='Responsible'
+    )
+
+def public_data_chart(public_data):
+    return px.bar(
+        public_data, 
+        x='Country', 
+        y=['Carbon_Price_USD_per_ton', 'Carbon_Tax_USD_per_ton', 'Carbon_Offset_Credits_USD_per_ton'],
+        barmode='group',
+        title='Carbon Price, Tax, and Offset Credits Comparison',
+        labels={'value': 'USD per Ton', 'variable': 'Type'}
+    )
+
+def financial_impact_chart(risk_df):
+    return px.bar(
+        risk_df, 
+        x='Subcategory', 
+        y='Financial_Impact',
+        color='Risk_Category',
+        title='Financial Impact by Risk Subcategory',
+        labels={'Financial_Impact': 'Financial Impact (USD)'}
+    )
+
+def loss_distribution_chart(counts, edges):
+    return px.bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        title='Distribution of Total Annual Loss',
+        labels={'x': 'Total Loss (USD)', 'y': 'Simulated Years'}
+    )
+
+def adjusted_impact_chart(adjusted_severity):
+    return px.bar(
+        adjusted_severity, 
+        x='Subcategory', 
+        y='Financial_Impact',
+        color='Risk_Category',
+        title='Adjusted Financial Impact by Risk Subcategory',
+        labels={'Financial_Impact': 'Financial Impact (USD)'}
+    )
+
+def regulations_status_chart(status_counts):
+    return px.pie(
+        status_counts,
+        names='Status',
+        values='Count',
+        title='Regulations Status Distribution',
+        color='Status',
+        color_discrete_map={
+            'Completed': SUCCESS_COLOR,
+            'In Progress': WARNING_COLOR,
+            'Planned': ERROR_COLOR
+        }
+    )
+
+def roi_reduction_chart(projects_df):
+    return fast_scatter(
+        projects_df,
+        x='Estimated_Carbon_Reduction_tons',
+        y='ROI_Percentage',
+        size='Estimated_Carbon_Reduction_tons',
+        color='Department',
+        hover_name='Project',
+        title='ROI vs. Carbon Reduction',
+        labels={
+            'Estimated_Carbon_Reduction_tons': 'Estimated Carbon Reduction (tons)',
+            'ROI_Percentage': 'Return on Investment (%)'
+        },
+        size_max=60
+    )
+
+def priority_scores_chart(projects_df):
+    return px.bar(
+        projects_df,
+        x='Project',
+        y='Priority_Score',
+        color='Priority_Score',
+        title='Project Priority Scores',
+        labels={'Priority_Score': 'Priority Score'},
+        color_continuous_scale='Blues'
+    )
+
+def macc_chart(macc_df):
+    fig = go.Figure(go.Bar(
+        x=(macc_df['Start_tons'] + macc_df['End_tons']) / 2,
+        y=macc_df['Cost_per_ton'],
+        width=macc_df['Abatement_tons'],
+        customdata=macc_df[['Project', 'Abatement_tons']],
+        hovertemplate="%{customdata[0]}<br>$%{y:,.2f} per ton<br>%{customdata[1]:,.0f} tons/year<extra></extra>",
+        marker_line_width=0.5,
+    ))
+    fig.update_layout(
+        title='Marginal Abatement Cost Curve',
+        xaxis_title='Cumulative Abatement (tons CO2 per year)',
+        yaxis_title='Annualised Cost (USD per ton)',
+        bargap=0
+    )
+    return fig
+
+def project_map_chart(projects_df, zoom=10, center=None):
+    index = get_geo_index(projects_df)
+    if len(index) > MAP_MARKER_LIMIT:
+        # Too many locations for one marker each: draw clusters until the
+        # view is zoomed in far enough to hold few enough projects
+        center = center or index.center()
+        shown, clustered = index.view(zoom, center)
+        if clustered:
+            fig = px.scatter_mapbox(
+                shown,
+                lat="Latitude",
+                lon="Longitude",
+                hover_data={"Projects": ":,", "Estimated_Carbon_Reduction_tons": ":,.0f"},
+                size="Estimated_Carbon_Reduction_tons",
+                size_max=40,
+                zoom=zoom,
+                center=center,
+                height=600,
+                title=f"Geographical Distribution of Projects ({len(index):,} projects, clustered)"
+            )
+            fig.update_layout(mapbox_style="open-street-map")
+            fig.update_layout(margin={"r":0,"t":50,"l":0,"b":0})
+            return fig
+        projects_df = projects_df.iloc[shown]
+    fig = px.scatter_mapbox(
+        projects_df,
+        lat="Latitude",
+        lon="Longitude",
+        hover_name="Project",
+        hover_data=["Description", "Estimated_Carbon_Reduction_tons", "Department"],
+        color="Department",
+        size="Estimated_Carbon_Reduction_tons",
+        size_max=15,
+        zoom=zoom,
+        center=center,
+        height=600,
+        title="Geographical Distribution of Projects"
+    )
+    fig.update_layout(mapbox_style="open-street-map")
+    fig.update_layout(margin={"r":0,"t":50,"l":0,"b":0})
+    return fig
+
+def kpi_progress_chart(kpi_melted):
+    fig = px.bar(
+        kpi_melted,
+        x='KPI',
+        y='Amount',
+        color='Type',
+        barmode='group',
+        title='Current Values vs. Targets',
+        labels={'Amount': 'Amount (USD)', 'KPI': 'Key Performance Indicator'},
+        color_discrete_map={'Value': PRIMARY_COLOR, 'Target': "lightgray"},
+        text='Amount'
+    )
+
+    # Enhance the chart layout
+    fig.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
+    fig.update_layout(
+        uniformtext_minsize=8,
+        uniformtext_mode='hide',
+        xaxis_title="KPI",
+        yaxis_title="Amount (USD)",
+        legend_title="Type",
+        title_x=0.5  # Center the title
+    )
+    return fig
+
+def investment_reduction_chart(scenario_df):
+    return fast_scatter(
+        scenario_df,
+        x='Investment_USD',
+        y='Estimated_Carbon_Reduction_tons',
+        size='Estimated_Carbon_Reduction_tons',
+        color='Status',
+        hover_name='Scenario',
+        title='Investment vs. Carbon Reduction Across Scenarios',
+        labels={
+            'Investment_USD': 'Investment (USD)',
+            'Estimated_Carbon_Reduction_tons': 'Estimated Carbon Reduction (tons)'
+        },
+        size_max=60
+    )
+
+def sweep_chart(definition):
+    sweep = run_sweep(definition)
+    frontier = sweep[sweep['Pareto']].sort_values('Cost_USD')
+    # Plot a sample of the cloud; the frontier is drawn in full
+    cloud = sweep.sample(n=min(len(sweep), 5_000), random_state=0)
+    fig = px.scatter(
+        cloud,
+        x='Cost_USD',
+        y='Carbon_Reduction_tons',
+        opacity=0.3,
+        render_mode='webgl',
+        title='Cost vs. Carbon Reduction',
+        labels={'Cost_USD': 'Total Cost (USD)', 'Carbon_Reduction_tons': 'Carbon Reduction (tons)'}
+    )
+    fig.add_scatter(
+        x=frontier['Cost_USD'], y=frontier['Carbon_Reduction_tons'],
+        mode='lines+markers', name='Pareto frontier'
+    )
+    return fig
+
+def compliance_status_chart(status_counts):
+    return px.pie(
+        status_counts,
+        names='Compliance_Status',
+        values='Count',
+        title='Compliance Status Distribution',
+        color='Compliance_Status',
+        color_discrete_map={
+            'Compliant': SUCCESS_COLOR,
+            'In Progress': WARNING_COLOR,
+            'Planned': ERROR_COLOR
+        }
+    )
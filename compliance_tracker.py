@@ -2,8 +2,12 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from utils.helpers import load_csv, add_header, add_footer, SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR
+from utils.charts import compliance_status_chart
+from utils.exports import png_export
+from utils.figures import cached_figure, source_versions
+from utils.helpers import load_csv, add_header, add_footer
+from utils.store import count_by
+from utils.watcher import watch_datasets
 
 def display_compliance_tracker():
     """
@@ -14,7 +18,9 @@ def display_compliance_tracker():
     st.header("Regulatory Compliance Status")
     
     # Load compliance data
+    sources = source_versions("data/compliance_tracker.csv")
     compliance_df = load_csv("data/compliance_tracker.csv")
+    watch_datasets("data/compliance_tracker.csv")
     
     if not compliance_df.empty:
         # Display Compliance Data
@@ -33,24 +39,14 @@ def display_compliance_tracker():
         
         # Visualization: Compliance Status Pie Chart
         st.subheader("Compliance Status Distribution")
-        fig = px.pie(
-            compliance_df,
-            names='Compliance_Status',
-            title='Compliance Status Distribution',
-            color='Compliance_Status',
-            color_discrete_map={
-                'Compliant': SUCCESS_COLOR,
-                'In Progress': WARNING_COLOR,
-                'Planned': ERROR_COLOR
-            }
-        )
+        status_counts = count_by("data/compliance_tracker.csv", 'Compliance_Status')
+        fig = cached_figure(compliance_status_chart, status_counts, sources=sources)
         st.plotly_chart(fig, use_container_width=True)
         
         # Download Chart as Image
-        img_bytes = fig.to_image(format="png")
         st.download_button(
             label="Download Compliance Chart",
-            data=img_bytes,
+            data=png_export(fig),
             file_name='compliance_chart.png',
             mime='image/png',
             key='download_compliance_chart_unique'
@@ -2,12 +2,18 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from utils.charts import tasks_by_department_chart, public_data_chart
+from utils.exports import png_export
+from utils.figures import cached_figure, source_versions
 from utils.helpers import load_csv, add_header, add_footer
+from utils.store import count_by
+from utils.watcher import watch_datasets
 
 def display_esg_tasks():
     st.subheader("ESG Report Task List")
+    sources = source_versions("data/esg_tasks.csv")
     esg_df = load_csv("data/esg_tasks.csv")
+    watch_datasets("data/esg_tasks.csv")
     if not esg_df.empty:
         # Display DataFrame
         st.dataframe(esg_df)
@@ -24,36 +30,24 @@ def display_esg_tasks():
         
         # Optional: Group tasks by Responsible Department
         st.markdown("### Tasks by Department")
-        grouped = esg_df.groupby('Responsible').size().reset_index(name='Task Count')
-        fig = px.bar(
-            grouped,
-            x='Responsible',
-            y='Task Count',
-            title='Number of Tasks per Department',
-            labels={'Responsible': 'Department', 'Task Count': 'Number of Tasks'},
-            color='Responsible'
-        )
+        grouped = count_by("data/esg_tasks.csv", 'Responsible', name='Task Count')
+        fig = cached_figure(tasks_by_department_chart, grouped, sources=sources)
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.warning("No ESG tasks available.")
 
 def display_public_data_main():
     st.subheader("Public Data: Carbon Price, Tax, and Offset Credits")
+    sources = source_versions("data/public_data.csv")
     public_data = load_csv("data/public_data.csv")
+    watch_datasets("data/public_data.csv")
     
     if not public_data.empty:
         # Display table
         st.dataframe(public_data)
         
         # Display chart
-        fig = px.bar(
-            public_data, 
-            x='Country', 
-            y=['Carbon_Price_USD_per_ton', 'Carbon_Tax_USD_per_ton', 'Carbon_Offset_Credits_USD_per_ton'],
-            barmode='group',
-            title='Carbon Price, Tax, and Offset Credits Comparison',
-            labels={'value': 'USD per Ton', 'variable': 'Type'}
-        )
+        fig = cached_figure(public_data_chart, public_data, sources=sources)
         st.plotly_chart(fig, use_container_width=True)
         
         # Download Public Data
@@ -67,10 +61,9 @@ def display_public_data_main():
         )
         
         # Download Chart as Image
-        img_bytes = fig.to_image(format="png")
         st.download_button(
             label="Download Public Data Chart",
-            data=img_bytes,
+            data=png_export(fig),
             file_name='public_data_chart.png',
             mime='image/png',
             key='download_public_data_chart_dashboard_unique'
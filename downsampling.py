@@ -0,0 +1,73 @@
+# utils/downsampling.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+# Scatter charts switch to WebGL above WEBGL_POINTS points and are thinned
+# to at most MAX_SCATTER_POINTS before being sent to the browser
+WEBGL_POINTS = int(os.environ.get("ESG_WEBGL_POINTS", "1000"))
+MAX_SCATTER_POINTS = int(os.environ.get("ESG_MAX_SCATTER_POINTS", "5000"))
+
+def _axis_values(values):
+    """
+    Returns a column as floats for binning: numbers as they are, dates as
+    nanoseconds and anything else by category code.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return np.where(values.isna(), np.nan, values.astype("int64").to_numpy(dtype=float))
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    codes, _ = pd.factorize(values)
+    return np.where(codes >= 0, codes, np.nan).astype(float)
+
+def _cells(values, bins):
+    low, high = np.nanmin(values), np.nanmax(values)
+    span = high - low if high > low else 1.0
+    return np.clip(((values - low) / span * bins).astype(int), 0, bins - 1)
+
+def downsample_points(df, x, y, max_points=MAX_SCATTER_POINTS, by=None, weight=None):
+    """
+    Density binning: lays a grid over the x/y extent and keeps one point per
+    occupied cell (per `by` group, so every colour stays visible), the one
+    with the largest `weight` when given. The grid is coarsened until at
+    most max_points remain. Rows without an x or y are dropped, as Plotly
+    would not draw them anyway.
+    """
+    if len(df) <= max_points:
+        return df
+    xv, yv = _axis_values(df[x]), _axis_values(df[y])
+    plotted = ~(np.isnan(xv) | np.isnan(yv))
+    df, xv, yv = df[plotted], xv[plotted], yv[plotted]
+    if len(df) <= max_points:
+        return df
+
+    groups = pd.factorize(df[by])[0] + 1 if by is not None else np.zeros(len(df), dtype=int)
+    # Visit heavier points first so each cell keeps its largest marker
+    order = np.argsort(-df[weight].fillna(0).to_numpy(dtype=float), kind="stable") if weight is not None else np.arange(len(df))
+    bins = max(int(np.sqrt(max_points)), 1)
+    while True:
+        key = (groups * bins + _cells(xv, bins)) * bins + _cells(yv, bins)
+        _, first = np.unique(key[order], return_index=True)
+        if len(first) <= max_points or bins == 1:
+            break
+        bins = max(bins * 3 // 4, 1)
+    keep = np.sort(order[first][:max_points])
+    return df.iloc[keep]
+
+def fast_scatter(data_frame, x, y, max_points=MAX_SCATTER_POINTS, **kwargs):
+    """
+    px.scatter for charts that may hold many points: above max_points the
+    data is density-binned on the server (see downsample_points), and above
+    WEBGL_POINTS the traces are drawn with WebGL instead of SVG. The title
+    notes how many points are shown when some were dropped.
+    """
+    shown = downsample_points(data_frame, x, y, max_points, by=kwargs.get("color"), weight=kwargs.get("size"))
+    render_mode = "webgl" if len(shown) > WEBGL_POINTS else "svg"
+    fig = px.scatter(shown, x=x, y=y, render_mode=render_mode, **kwargs)
+    if len(shown) < len(data_frame):
+        title = kwargs.get("title") or ""
+        fig.update_layout(title_text=f"{title}<br><sup>Showing {len(shown):,} of {len(data_frame):,} points, one per area of the chart</sup>")
+    return fig
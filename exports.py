@@ -0,0 +1,91 @@
+# utils/exports.py
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import multiprocessing
+import os
+import threading
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.figures import FigureCache
+
+# Renderer processes kept alive between exports; kaleido stays warm in each
+EXPORT_WORKERS = int(os.environ.get("ESG_EXPORT_WORKERS", "2"))
+EXPORT_CACHE_BYTES = int(os.environ.get("ESG_EXPORT_CACHE_MB", "64")) * 1024 * 1024
+
+_PNGS = FigureCache(EXPORT_CACHE_BYTES)
+_pool = None
+_pool_lock = threading.Lock()
+
+def _warm_up():
+    # The first export in a process starts kaleido's browser; pay for it at pool start
+    try:
+        go.Figure().to_image(format="png", width=10, height=10)
+    except Exception as e:
+        print(f"PNG renderer warm-up failed: {e}")
+
+def _render(figure_json, options):
+    return pio.from_json(figure_json).to_image(format="png", **options)
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: a fork of the multithreaded server could copy
+            # a lock another thread holds and deadlock the renderer on it
+            _pool = ProcessPoolExecutor(
+                max_workers=EXPORT_WORKERS, initializer=_warm_up,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+def _png_key(figure_json, options):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(figure_json.encode())
+    digest.update(repr(sorted(options.items())).encode())
+    return digest.hexdigest()
+
+def figure_pngs(figs, **options):
+    """
+    Renders several figures to PNG bytes at once, in order. Cached charts
+    are reused; the rest are rendered concurrently across the pool.
+    """
+    jobs = [fig.to_json() for fig in figs]
+    keys = [_png_key(figure_json, options) for figure_json in jobs]
+    pngs = [_PNGS.get(key) for key in keys]
+    missing = [i for i, png in enumerate(pngs) if png is None]
+    try:
+        futures = {i: _get_pool().submit(_render, jobs[i], options) for i in missing}
+        for i, future in futures.items():
+            pngs[i] = future.result()
+    except BrokenProcessPool:
+        # A renderer died; start a fresh pool next time and render the rest here
+        _reset_pool()
+        for i in missing:
+            if pngs[i] is None:
+                pngs[i] = _render(jobs[i], options)
+    for i in missing:
+        _PNGS.put(keys[i], pngs[i])
+    return pngs
+
+def figure_png(fig, **options):
+    """
+    Renders a figure to PNG bytes on the renderer pool. Results are cached by
+    a hash of the figure and options, so an unchanged chart renders once.
+    """
+    return figure_pngs([fig], **options)[0]
+
+def png_export(fig, **options):
+    """
+    Returns a zero-argument callable for st.download_button's data, so the
+    PNG is only rendered when the user clicks the button.
+    """
+    return lambda: figure_png(fig, **options)
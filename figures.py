@@ -0,0 +1,92 @@
+# utils/figures.py
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from utils.helpers import BoundedLRU, dataset_fingerprint
+
+# Upper bound on the serialized figures kept in memory, shared by every session
+FIGURE_CACHE_BYTES = int(os.environ.get("ESG_FIGURE_CACHE_MB", "64")) * 1024 * 1024
+
+class FigureCache(BoundedLRU):
+    """
+    Figure JSON (or rendered PNG bytes) kept across sessions, evicting the
+    least recently used once their total size passes max_bytes.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        super().__init__(max_bytes)
+
+_FIGURES = FigureCache()
+
+def _update_digest(digest, value):
+    """
+    Feeds a chart argument into the cache key: DataFrames and arrays by
+    content, everything else by repr.
+    """
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+def source_versions(*paths):
+    """
+    Returns the current fingerprints of the datasets a chart is built from,
+    for cached_figure's sources. Read them before loading the datasets: the
+    cache only moves to newer versions, so a frame is never older than the
+    fingerprints read ahead of it, and a chart can never be stored under a
+    newer version than the data it was drawn from.
+    """
+    return tuple((path, dataset_fingerprint(path)) for path in paths)
+
+def figure_key(builder, args, params, sources=()):
+    """
+    Returns the cache key of a chart: the builder's name plus either the
+    fingerprints of the datasets it was derived from or, when those are not
+    given or were not loaded yet, the content of its arguments.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{builder.__module__}.{builder.__qualname__}".encode())
+    fingerprints = [fingerprint for _, fingerprint in sources]
+    if sources and all(fingerprints):
+        digest.update(repr(fingerprints).encode())
+        args = [arg for arg in args if not isinstance(arg, (pd.DataFrame, pd.Series, np.ndarray))]
+    for arg in args:
+        _update_digest(digest, arg)
+    for name in sorted(params):
+        digest.update(name.encode())
+        _update_digest(digest, params[name])
+    return digest.hexdigest()
+
+def cached_figure(builder, *args, sources=(), **params):
+    """
+    Returns builder(*args, **params) as a Plotly figure, rebuilding it only
+    when its data or parameters changed.
+
+    sources is the source_versions() of the data/*.csv files the DataFrame
+    arguments come from, read before those files were loaded; when given,
+    their fingerprints stand in for hashing the frames, so any frame
+    argument must be derived from those files and the other arguments alone.
+    """
+    key = figure_key(builder, args, params, sources)
+    figure_json = _FIGURES.get(key)
+    if figure_json is None:
+        figure_json = builder(*args, **params).to_json()
+        _FIGURES.put(key, figure_json)
+    # Return the stored form on a miss too, so the same chart always
+    # serializes the same way (exported PNGs are keyed on it)
+    return pio.from_json(figure_json)
+
+def clear_figure_cache():
+    _FIGURES.clear()
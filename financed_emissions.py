@@ -0,0 +1,76 @@
+# utils/financed_emissions.py
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.schemas import apply_schema, get_schema, read_options
+
+# Optional loan and investment book; see the loan_book.csv entry in utils.schemas
+LOAN_BOOK_PATH = os.path.join("data", "loan_book.csv")
+
+GROUP_COLUMNS = ["Asset_Class", "Sector", "Owner"]
+
+# Aggregates per loan book path, with the (mtime, size) they were computed from
+_RESULTS = {}
+_results_lock = threading.Lock()
+
+def attribute_emissions(chunk):
+    """
+    PCAF attribution: each counterparty's emissions times the bank's share
+    of it, Outstanding_USD / EVIC_USD. The share is capped at 1, and rows
+    without a usable EVIC attribute nothing.
+    """
+    outstanding = chunk["Outstanding_USD"].to_numpy(dtype=float, na_value=np.nan)
+    evic = chunk["EVIC_USD"].to_numpy(dtype=float, na_value=np.nan)
+    factor = np.divide(outstanding, evic, out=np.zeros_like(outstanding), where=evic > 0)
+    factor = np.clip(np.nan_to_num(factor), 0, 1)
+    emissions = np.nan_to_num(chunk["Counterparty_Emissions_tons"].to_numpy(dtype=float, na_value=np.nan))
+    return factor * emissions
+
+def compute_financed_emissions(file_path=LOAN_BOOK_PATH, chunksize=500_000):
+    """
+    Streams a loan book in chunks and returns financed emissions in tons,
+    summed by Asset_Class, Sector and Owner. Only the running totals per
+    group are kept between chunks, so memory does not grow with the file.
+    The result is cached until the file changes.
+    """
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _results_lock:
+        cached = _RESULTS.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1].copy()
+
+    schema = get_schema(file_path)
+    totals = None
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, **read_options(schema)):
+        chunk = apply_schema(chunk, schema)
+        grouped = (
+            chunk[GROUP_COLUMNS].astype(object).fillna("Unassigned")
+            .assign(Financed_Emissions_tons=attribute_emissions(chunk), Outstanding_USD=chunk["Outstanding_USD"])
+            .groupby(GROUP_COLUMNS)[["Financed_Emissions_tons", "Outstanding_USD"]].sum()
+        )
+        totals = grouped if totals is None else totals.add(grouped, fill_value=0)
+
+    if totals is None:
+        result = pd.DataFrame(columns=GROUP_COLUMNS + ["Financed_Emissions_tons", "Outstanding_USD"])
+    else:
+        result = totals.reset_index()
+    with _results_lock:
+        _RESULTS[key] = (version, result)
+    print(f"Computed financed emissions from data/{os.path.basename(file_path)}.")
+    return result.copy()
+
+def loan_book_version(file_path=LOAN_BOOK_PATH):
+    """
+    Returns the (mtime, size) of the loan book, or None if there is none.
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,147 @@
+# utils/geo_clusters.py
+
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Maps with more located rows than this are clustered; a zoomed-in view
+# switches to individual markers once it holds no more than this many
+MAP_MARKER_LIMIT = int(os.environ.get("ESG_MAP_MARKERS", "2000"))
+
+# Finest grid the index is built on: 2^24 cells per axis, well under a metre
+MAX_LEVEL = 24
+# Clusters are cells of 256 / 2^CELL_BITS = 64 screen pixels at the chosen zoom
+CELL_BITS = 2
+MAX_LATITUDE = 85.05112878
+
+def _spread_bits(values):
+    # Interleaves zeros between the low 32 bits: abcd -> 0a0b0c0d
+    values = values & np.uint64(0x00000000FFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+def mercator(lat, lon):
+    """
+    Web Mercator position of each point as x, y in [0, 1), the projection
+    map tiles use, so a grid cell here is a square on screen.
+    """
+    lat = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    x = (np.asarray(lon, dtype=float) + 180) / 360
+    y = (1 - np.log(np.tan(lat) + 1 / np.cos(lat)) / np.pi) / 2
+    return np.clip(x, 0, np.nextafter(1, 0)), np.clip(y, 0, np.nextafter(1, 0))
+
+class GeoIndex:
+    """
+    Spatial index over Latitude/Longitude for map aggregation.
+
+    Rows are sorted once by the Z-order (Morton) code of their cell on the
+    finest grid, the same ordering a geohash uses. A coarser cell is a
+    prefix of that code, so at any zoom the rows of one cluster are a
+    contiguous run and clustering is a single pass with no sort.
+    """
+
+    def __init__(self, projects_df, weight="Estimated_Carbon_Reduction_tons"):
+        lat = projects_df['Latitude'].to_numpy(dtype=float, na_value=np.nan)
+        lon = projects_df['Longitude'].to_numpy(dtype=float, na_value=np.nan)
+        located = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon))
+        x, y = mercator(lat[located], lon[located])
+        cells = np.uint64(1 << MAX_LEVEL)
+        code = (_spread_bits((x * cells).astype(np.uint64)) << np.uint64(1)) | _spread_bits((y * cells).astype(np.uint64))
+        order = np.argsort(code, kind="stable")
+
+        self.rows = located[order]
+        self.code = code[order]
+        self.x, self.y = x[order], y[order]
+        self.lat, self.lon = lat[self.rows], lon[self.rows]
+        self.weight = np.nan_to_num(projects_df[weight].to_numpy(dtype=float, na_value=np.nan)[self.rows])
+        self._clusters = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def fit_zoom(self, width=1000, height=600):
+        """
+        Largest whole zoom level at which every located row is in view.
+        """
+        if not len(self):
+            return 1
+        span_x = max(self.x.max() - self.x.min(), 1e-9)
+        span_y = max(self.y.max() - self.y.min(), 1e-9)
+        zoom = np.floor(np.log2(min(width / span_x, height / span_y) / 256))
+        return int(np.clip(zoom, 0, MAX_LEVEL - CELL_BITS))
+
+    def center(self):
+        if not len(self):
+            return {"lat": 0.0, "lon": 0.0}
+        return {"lat": float((self.lat.min() + self.lat.max()) / 2), "lon": float((self.lon.min() + self.lon.max()) / 2)}
+
+    def clusters(self, zoom):
+        """
+        Returns one row per occupied cell at this zoom: its Latitude and
+        Longitude (the mean of its projects), the number of Projects and
+        their summed Estimated_Carbon_Reduction_tons. Computed once per zoom.
+        """
+        zoom = int(np.clip(zoom, 0, MAX_LEVEL - CELL_BITS))
+        with self._lock:
+            cached = self._clusters.get(zoom)
+        if cached is not None:
+            return cached
+        cell = self.code >> np.uint64(2 * (MAX_LEVEL - zoom - CELL_BITS))
+        starts = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]])[:len(cell)]
+        counts = np.diff(np.r_[starts, len(cell)])
+        result = pd.DataFrame({
+            "Latitude": np.add.reduceat(self.lat, starts) / counts,
+            "Longitude": np.add.reduceat(self.lon, starts) / counts,
+            "Projects": counts,
+            "Estimated_Carbon_Reduction_tons": np.add.reduceat(self.weight, starts),
+            "_x": np.add.reduceat(self.x, starts) / counts,
+            "_y": np.add.reduceat(self.y, starts) / counts,
+        })
+        with self._lock:
+            self._clusters[zoom] = result
+        return result
+
+    def _in_view(self, x, y, zoom, center, width, height):
+        cx, cy = mercator(center["lat"], center["lon"])
+        scale = 256 * 2.0 ** zoom
+        return (np.abs(x - cx) * scale <= width / 2) & (np.abs(y - cy) * scale <= height / 2)
+
+    def view(self, zoom, center, width=1000, height=600, marker_limit=MAP_MARKER_LIMIT):
+        """
+        What a map at this zoom and center should draw: the positions of the
+        individual rows in view when there are at most marker_limit of them,
+        otherwise the clusters in view. Returns (positions or clusters,
+        clustered).
+        """
+        in_view = self._in_view(self.x, self.y, zoom, center, width, height)
+        if np.count_nonzero(in_view) <= marker_limit:
+            return self.rows[in_view], False
+        clusters = self.clusters(zoom)
+        visible = self._in_view(clusters["_x"].to_numpy(), clusters["_y"].to_numpy(), zoom, center, width, height)
+        return clusters[visible].drop(columns=["_x", "_y"]), True
+
+# Last index built, with the hash of the table it was built from
+_INDEX = None
+_index_lock = threading.Lock()
+
+def get_geo_index(projects_df):
+    """
+    Returns the GeoIndex for a projects table, building it only when the
+    table changed since the last call.
+    """
+    global _INDEX
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(projects_df[['Latitude', 'Longitude', 'Estimated_Carbon_Reduction_tons']], index=True).to_numpy().tobytes())
+    key = digest.hexdigest()
+    with _index_lock:
+        if _INDEX is not None and _INDEX[0] == key:
+            return _INDEX[1]
+        index = GeoIndex(projects_df)
+        _INDEX = (key, index)
+        return index
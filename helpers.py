@@ -1,27 +1,165 @@
 # utils/helpers.py
 
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+
 import pandas as pd
 import streamlit as st
 
+from utils.calculations import calculate_financial_impact
+from utils.rollups import refresh_rollups
+from utils.schemas import apply_schema, get_schema, read_options
+from utils.snapshots import is_snapshot_fresh, read_snapshot
+
 # Define Color Variables
 PRIMARY_COLOR = "#1f77b4"  # Replace with Bank Leumi’s primary color if different
 SUCCESS_COLOR = "#2ca02c"
 WARNING_COLOR = "#ff7f0e"
 ERROR_COLOR = "#d62728"
 
+# Copy-on-Write lets every session hold a lazy view of a cached frame: derived
+# columns and filters share the cached buffers, and only the data a session
+# actually modifies gets copied. It is always on from pandas 3.
+if int(pd.__version__.split(".")[0]) == 2:
+    pd.set_option("mode.copy_on_write", True)
+
+# Process-wide dataset cache shared by every Streamlit session.
+# Maps the absolute file path to its fingerprint and the parsed DataFrame.
+_DATASET_CACHE = {}
+_DATASET_CACHE_LOCK = threading.Lock()
+
+class BoundedLRU:
+    """
+    Least-recently-used store bounded by size rather than entry count: the
+    oldest entries are evicted once the total passes max_bytes. sizeof
+    gives an entry's size in bytes; the default, len, fits strings and
+    bytes. Entries larger than max_bytes are not stored.
+    """
+
+    def __init__(self, max_bytes, sizeof=len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+def _file_digest(file_path, prefix_size=None):
+    """
+    Returns the BLAKE2 digest of a file's contents and, in the same pass,
+    the digest of its first prefix_size bytes when those end a line (None
+    otherwise), so an append to a previously loaded version can be spotted.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    prefix_hash, read = None, 0
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            if prefix_size and read < prefix_size <= read + len(block):
+                head = block[:prefix_size - read]
+                digest.update(head)
+                if head.endswith(b"\n"):
+                    prefix_hash = digest.copy().hexdigest()
+                digest.update(block[prefix_size - read:])
+            else:
+                digest.update(block)
+            read += len(block)
+    return digest.hexdigest(), prefix_hash
+
+def dataset_fingerprint(file_path):
+    """
+    Returns the (mtime, size, content hash) fingerprint of a cached dataset,
+    or None if the file has not been loaded yet.
+    """
+    entry = _DATASET_CACHE.get(os.path.abspath(file_path))
+    return entry["fingerprint"] if entry else None
+
+def clear_dataset_cache():
+    """
+    Drops every cached dataset so the next load_csv call re-reads from disk.
+    """
+    with _DATASET_CACHE_LOCK:
+        _DATASET_CACHE.clear()
+
 def load_csv(file_path):
     """
-    Loads a CSV file and returns a pandas DataFrame.
+    Loads a CSV file and returns a pandas DataFrame typed according to its
+    entry in utils.schemas.
+
+    Parsed frames are cached once per process and shared across sessions.
+    A cheap stat() check runs on every call; the file is only hashed when its
+    mtime or size changed, and only re-parsed when its content changed.
+    If a snapshot newer than the CSV exists (see snapshot_data.py), it is
+    memory-mapped instead of parsing the CSV.
+
+    The returned frame is a copy-on-write view of the cached one, so callers
+    may add or overwrite columns without affecting other sessions.
     """
+    name = os.path.basename(file_path)
+    key = os.path.abspath(file_path)
     try:
-        df = pd.read_csv(file_path)
-        print(f"Loaded data/{file_path.split('/')[-1]} successfully.")
-        return df
+        stat = os.stat(key)
+        entry = _DATASET_CACHE.get(key)
+        if entry and entry["fingerprint"][:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry["df"].copy(deep=False)
+
+        with _DATASET_CACHE_LOCK:
+            # Another session may have reloaded the file while we waited.
+            entry = _DATASET_CACHE.get(key)
+            if entry and entry["fingerprint"][:2] == (stat.st_mtime_ns, stat.st_size):
+                return entry["df"].copy(deep=False)
+
+            content_hash, prefix_hash = _file_digest(key, entry["fingerprint"][1] if entry else None)
+            fingerprint = (stat.st_mtime_ns, stat.st_size, content_hash)
+            if entry and entry["fingerprint"][2] == content_hash:
+                # Touched but unchanged: keep the parsed frame.
+                entry["fingerprint"] = fingerprint
+                return entry["df"].copy(deep=False)
+
+            schema = get_schema(key)
+            if is_snapshot_fresh(key):
+                # Snapshots written by ingest.py store categoricals as plain strings
+                df = apply_schema(read_snapshot(key), schema)
+            else:
+                df = apply_schema(pd.read_csv(key, **read_options(schema)), schema)
+            # Rows appended past the previous version only add to its counts
+            appended = entry is not None and prefix_hash == entry["fingerprint"][2]
+            refresh_rollups(key, df, previous=entry["df"] if appended else None)
+            _DATASET_CACHE[key] = {"fingerprint": fingerprint, "df": df}
+        print(f"Loaded data/{name} successfully.")
+        return df.copy(deep=False)
     except FileNotFoundError:
-        print(f"File data/{file_path.split('/')[-1]} not found.")
+        print(f"File data/{name} not found.")
         return pd.DataFrame()
     except Exception as e:
-        print(f"Error loading data/{file_path.split('/')[-1]}: {e}")
+        print(f"Error loading data/{name}: {e}")
         return pd.DataFrame()
 
 def add_header(title):
@@ -44,10 +182,3 @@ def add_footer():
         """,
         unsafe_allow_html=True
     )
-
-def calculate_financial_impact(df):
-    """
-    Calculates the financial impact based on Probability and Severity.
-    """
-    df['Financial_Impact'] = df['Probability'] * df['Severity']
-    return df
\ No newline at end of file
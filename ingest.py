@@ -0,0 +1,127 @@
+# ingest.py
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils.schemas import apply_schema, get_schema
+from utils.snapshots import arrow_schema, snapshot_path
+from validate_csv import EXTRA_FIELDS, validate_csv
+
+def _raw_chunks(file_path, schema, chunksize):
+    """
+    Streams a CSV as raw string chunks in the dataset's column order, so rows
+    are written back exactly as they were read. A row with more fields than
+    the header raises ValueError instead of losing its extra values.
+    """
+    with open(file_path, newline="", encoding=schema.encoding) as f:
+        header = next(csv.reader(f), [])
+    extras = [f"__extra_{i}__" for i in range(EXTRA_FIELDS)]
+    reader = pd.read_csv(
+        file_path, encoding=schema.encoding, header=None, skiprows=1, names=header + extras,
+        dtype=str, keep_default_na=False, chunksize=chunksize,
+    )
+    offset = 0
+    for chunk in reader:
+        shifted = np.flatnonzero((chunk[extras].fillna("") != "").any(axis=1).to_numpy())
+        if len(shifted):
+            raise ValueError(
+                f"{file_path}: row {offset + int(shifted[0]) + 1} has more than {len(header)} fields; "
+                "fix it before ingesting"
+            )
+        offset += len(chunk)
+        yield chunk[list(schema.columns)]
+
+def _key_hashes(chunk, schema):
+    return pd.util.hash_pandas_object(chunk[list(schema.key)], index=False).to_numpy()
+
+def _keep_last(hashes):
+    """
+    Returns a mask that keeps only the last row for every key hash.
+    """
+    _, first_from_end = np.unique(hashes[::-1], return_index=True)
+    keep = np.zeros(len(hashes), dtype=bool)
+    keep[len(hashes) - 1 - first_from_end] = True
+    return keep
+
+def ingest(target, feeds, chunksize=100_000):
+    """
+    Merges feed files into a dataset CSV in bounded memory.
+
+    Pass 1 streams every file once and keeps only one 8-byte hash of the
+    natural key per row; a malformed row in any of them aborts the ingest
+    before anything is written. Pass 2 streams them again and writes the surviving
+    rows to both the CSV and its Arrow snapshot in the same loop. When a key
+    repeats, the last row wins and feed rows win over existing ones.
+    """
+    schema = get_schema(target)
+    if schema is None or not schema.key:
+        raise ValueError(f"{target} has no schema with a natural key in utils.schemas")
+
+    sources = ([target] if os.path.exists(target) else []) + list(feeds)
+    hashes = np.concatenate([
+        _key_hashes(chunk, schema)
+        for source in sources
+        for chunk in _raw_chunks(source, schema, chunksize)
+    ] or [np.empty(0, dtype=np.uint64)])
+    keep = _keep_last(hashes)
+
+    tmp_csv = target + ".tmp"
+    tmp_snapshot = snapshot_path(target) + ".tmp"
+    fields = arrow_schema(schema)
+    position = written = 0
+    with open(tmp_csv, "w", newline="", encoding="utf-8") as out, \
+            pa.ipc.new_file(tmp_snapshot, fields) as snapshot:
+        pd.DataFrame(columns=list(schema.columns)).to_csv(out, index=False)
+        for source in sources:
+            for chunk in _raw_chunks(source, schema, chunksize):
+                mask = keep[position:position + len(chunk)]
+                position += len(chunk)
+                chunk = chunk[mask]
+                chunk.to_csv(out, header=False, index=False)
+                typed = apply_schema(chunk.replace("", np.nan), schema)
+                for column in schema.categories:
+                    typed[column] = typed[column].astype(object)
+                snapshot.write_table(pa.Table.from_pandas(typed, schema=fields, preserve_index=False))
+                written += len(chunk)
+    os.replace(tmp_csv, target)
+    os.replace(tmp_snapshot, snapshot_path(target))
+    # The snapshot must not look older than the CSV it was written from
+    os.utime(snapshot_path(target))
+    return {"target": target, "rows_read": len(hashes), "rows_written": written}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Merge quarterly feed files into a dataset, deduplicating on its natural key."
+    )
+    parser.add_argument("target", help="dataset to merge into, e.g. data/risk_data.csv")
+    parser.add_argument("feeds", nargs="+", help="CSV files to ingest")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows read per chunk")
+    parser.add_argument("--report", default="ingest_report.json", help="where to write validation errors")
+    args = parser.parse_args(argv)
+
+    # The existing rows are written back too, so they must pass the same checks
+    existing = [args.target] if os.path.exists(args.target) else []
+    reports = [validate_csv(path, args.chunksize, schema_path=args.target) for path in existing + args.feeds]
+    error_count = sum(len(r["errors"]) for r in reports)
+    if error_count:
+        with open(args.report, "w") as f:
+            json.dump({"error_count": error_count, "files": reports}, f, indent=2)
+        print(f"Nothing ingested: {error_count} validation error(s), see {args.report}.")
+        return 1
+
+    result = ingest(args.target, args.feeds, args.chunksize)
+    print(
+        f"Ingested {len(args.feeds)} file(s) into {result['target']}: "
+        f"{result['rows_read']} rows read, {result['rows_written']} rows written."
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,10 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from utils.charts import kpi_progress_chart
+from utils.figures import cached_figure, source_versions
 from utils.helpers import load_csv, add_header, add_footer
+from utils.watcher import watch_datasets
 
 def display_kpi_dashboard():
     """
@@ -16,7 +18,9 @@ def display_kpi_dashboard():
     st.header("Key Performance Indicators (KPIs)")
 
     # Load KPI data
+    sources = source_versions("data/kpi_data.csv")
     kpi_df = load_csv("data/kpi_data.csv")
+    watch_datasets("data/kpi_data.csv")
 
     if not kpi_df.empty:
         # Define Colors
@@ -38,16 +42,9 @@ def display_kpi_dashboard():
             target = row['Target']
             status = row['Status']
 
-            # Convert 'Value' and 'Target' to float for calculations
-            try:
-                value_numeric = float(value)
-            except ValueError:
-                value_numeric = 0  # Default to 0 if conversion fails
-
-            try:
-                target_numeric = float(target)
-            except ValueError:
-                target_numeric = 1  # Avoid division by zero
+            # 'Value' and 'Target' are numeric from load time; unparsable cells are NaN
+            value_numeric = value if pd.notna(value) else 0
+            target_numeric = target if pd.notna(target) else 1  # Avoid division by zero
 
             # Assign each KPI to a column to prevent overlap
             col = cols[index % 3]
@@ -92,32 +89,10 @@ def display_kpi_dashboard():
             var_name='Type',
             value_name='Amount'
         )
-        kpi_melted['Amount'] = pd.to_numeric(kpi_melted['Amount'], errors='coerce')
         kpi_melted = kpi_melted.dropna(subset=['Amount'])  # Remove rows with NaN values
 
         # Create a grouped bar chart comparing current values against targets
-        fig = px.bar(
-            kpi_melted,
-            x='KPI',
-            y='Amount',
-            color='Type',
-            barmode='group',
-            title='Current Values vs. Targets',
-            labels={'Amount': 'Amount (USD)', 'KPI': 'Key Performance Indicator'},
-            color_discrete_map={'Value': PRIMARY_COLOR, 'Target': "lightgray"},
-            text='Amount'
-        )
-
-        # Enhance the chart layout
-        fig.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
-        fig.update_layout(
-            uniformtext_minsize=8,
-            uniformtext_mode='hide',
-            xaxis_title="KPI",
-            yaxis_title="Amount (USD)",
-            legend_title="Type",
-            title_x=0.5  # Center the title
-        )
+        fig = cached_figure(kpi_progress_chart, kpi_melted, sources=sources)
 
         # Display the grouped bar chart
         st.plotly_chart(fig, use_container_width=True)
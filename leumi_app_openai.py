@@ -7,6 +7,13 @@ import numpy as np
 import os
 import openai
 
+from leumi_datasets import get_carbon_exposure, get_dataset
+from utils.cashflows import DEFAULT_LIFETIME, DEFAULT_PRICE_PATHS, evaluate_projects
+from utils.downsampling import fast_scatter
+from utils.figures import cached_figure
+from utils.financed_emissions import compute_financed_emissions, loan_book_version
+from utils.trajectories import project_trajectories
+
 # --- Define the project root ---
 # Update this path to your main project directory
 PROJECT_ROOT = "/Users/aviluvchik/z_CLEARAPP/BankLeumi/bank_leumi_tool"
@@ -68,6 +75,134 @@ def generate_summary(text):
         st.error(f"Error generating summary: {e}")
         return None
 
+# --- Chart builders; pages fetch them through utils.figures.cached_figure ---
+def financed_emissions_chart(financed_by_sector):
+    return px.bar(
+        financed_by_sector,
+        x="Sector",
+        y="Financed_Emissions_tons",
+        color="Asset_Class",
+        title="Financed Emissions by Sector",
+        labels={"Financed_Emissions_tons": "Financed Emissions (tons CO₂)", "Asset_Class": "Asset Class"},
+    )
+
+def emissions_progress_chart(emissions_data):
+    return px.bar(
+        emissions_data,
+        x="Category",
+        y=["Emissions 2024 (tons CO₂)", "Target 2030 (tons CO₂)"],
+        title="Emissions vs. Targets",
+        barmode="group",
+        labels={"value": "Tons CO₂", "variable": "Type"},
+        height=600
+    )
+
+def net_zero_timeline_chart(tasks):
+    scatter_chart = fast_scatter(
+        tasks,
+        x="Deadline",
+        y="Task",
+        size="Completion (%)",
+        color="Owner",
+        title="Net Zero Path Timeline",
+        labels={"Deadline": "Timeline", "Task": "Tasks", "Completion (%)": "Completion (%)"},
+        height=600
+    )
+    scatter_chart.update_traces(marker=dict(symbol="circle", opacity=0.8))
+    scatter_chart.update_layout(xaxis_title="Timeline", yaxis_title="Tasks", showlegend=True)
+    return scatter_chart
+
+def emissions_trajectory_chart(trajectory_paths):
+    return px.line(
+        trajectory_paths,
+        x="Year",
+        y="Tons CO₂",
+        color="Path",
+        markers=True,
+        title="Total Emissions Trajectory, 2024–2030",
+    )
+
+def reduction_impact_chart(sector, reduction, current_emissions, reduced_emissions, target_emissions):
+    return px.bar(
+        x=["Current Emissions", f"{reduction}% Reduction Target", "Target 2030"],
+        y=[current_emissions, reduced_emissions, target_emissions],
+        title=f"Reduction Impact for {sector}",
+        labels={"x": "Scenario", "y": "Emissions (tons CO₂)"},
+        height=400
+    )
+
+def regulatory_radar_chart(radar_melted):
+    return px.line_polar(
+        radar_melted,
+        r="Score",
+        theta="Guideline",
+        color="Entity",
+        line_close=True,
+        title="Radar Chart: Bank Leumi vs International Best Practices",
+        range_r=[0, 100],  # ensures 0-100 scale
+        height=600
+    )
+
+def carbon_exposure_chart(curve, country, carbon_tax_rate):
+    fig = px.area(
+        curve,
+        x="Carbon Price (USD/ton)",
+        y="Annual Cost (USD)",
+        color="Scope",
+        title=f"Carbon Cost Exposure by Scope in {country}",
+    )
+    fig.add_vline(x=carbon_tax_rate, line_dash="dash")
+    return fig
+
+def project_capex_chart(projects_data):
+    return px.bar(
+        projects_data,
+        x="Project",
+        y="CAPEX (NIS millions)",
+        title="CAPEX for Major ESG Projects",
+        height=400
+    )
+
+def kpi_progress_chart(kpi_melted):
+    return px.bar(
+        kpi_melted,
+        x="KPI",
+        y="Value",
+        color="Year",
+        barmode="group",
+        title="KPI Progress Towards Targets",
+        labels={"Value": "Value", "KPI": "Key Performance Indicator"},
+        height=600
+    )
+
+def kpi_trend_chart(trend_data):
+    return px.line(
+        trend_data,
+        x="Year",
+        y=[
+            "Carbon Intensity (kg CO₂e / million NIS assets)", 
+            "Green Financing Volume (NIS billions)",
+            "Renewable Energy in Operations (%)",
+            "Female Representation in Management (%)",
+            "Supplier ESG Compliance Rate (%)"
+        ],
+        title="KPI Trend Over Time",
+        labels={"Value": "Value", "Year": "Year"},
+        height=600
+    )
+
+def kpi_benchmark_chart(benchmark_melted):
+    return px.bar(
+        benchmark_melted,
+        x="KPI",
+        y="Value",
+        color="Entity",
+        barmode="group",
+        title="KPI Comparison to Industry Benchmarks",
+        labels={"Value": "Value", "KPI": "Key Performance Indicator"},
+        height=600
+    )
+
 # -------------------------- Sidebar Navigation -------------------------- #
 tabs = [
     "Landing Page",
@@ -119,101 +254,67 @@ elif page == "Portfolio Carbon Analysis":
 
     # 2.1 Detailed Emissions Table
     st.header("Detailed Emissions Overview")
-    emissions_data = pd.DataFrame({
-        "Scope": [
-            "Scope 1", "Scope 1", "Scope 2", "Scope 2", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3",
-            "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3",
-            "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3"
-        ],
-        "Category": [
-            "Direct Emissions - Office Energy Use", "Direct Emissions - Company Vehicles",
-            "Indirect Energy Emissions - Purchased Electricity", "Indirect Energy Emissions - Cooling Systems",
-            "Financed Emissions - Corporate Loans", "Financed Emissions - Investments", "Business Travel",
-            "Supply Chain Emissions", "Data Centers", "Waste Management", "Office Supplies", "Outsourced Services",
-            "IT Equipment", "Marketing Activities", "Logistics Services", "Capital Goods", "Professional Services",
-            "Training Programs", "Food Services", "Printing Services", "Telecommunications", "Insurance Services",
-            "Legal Services", "Banking Services", "Cleaning Services", "Temporary Staffing"
-        ],
-        "Emissions 2024 (tons CO₂)": [
-            3049, 2542, 1698, 3958, 1975, 3799, 2892, 3956, 3294, 2239,
-            4523, 3783, 556, 1688, 4327, 2853, 1442, 4102, 3541, 3150,
-            3449, 4282, 4126, 1486, 2226, 3601
-        ],
-        "Target 2030 (tons CO₂)": [
-            1328, 670, 729, 855, 1224, 1965, 1105, 1542, 1186, 1206,
-            2320, 1550, 259, 949, 2316, 1362, 857, 1935, 1038, 747,
-            207, 79, 819, 1068, 1458, 2746
-        ],
-        "% of Target": [
-            0.5644, 0.7364, 0.5707, 0.7840, 0.3803, 0.4828, 0.6179, 0.6102, 0.6400, 0.4614,
-            0.4871, 0.5903, 0.5342, 0.4378, 0.4648, 0.5226, 0.4057, 0.5283, 0.7069, 0.7629,
-            0.9400, 0.9820, 0.8015, 0.2813, 0.3450, 0.2374
-        ],
-        "Owner": [
-            "Finance", "Legal", "Finance", "Legal", "IT Department", "HR", "Legal", "Finance", "HR", "Finance",
-            "Legal", "HR", "HR", "Sustainability Team", "Sustainability Team", "Operations", "Sustainability Team",
-            "IT Department", "Sustainability Team", "Operations", "Sustainability Team", "HR", "Sustainability Team",
-            "Operations", "Sustainability Team", "Finance"
-        ]
-    })
+    emissions_data = get_dataset("emissions")
     st.dataframe(emissions_data)
 
+    # Financed emissions are attributed from the loan book when data/loan_book.csv exists
+    if loan_book_version() is not None:
+        financed = compute_financed_emissions()
+        st.subheader("Financed Emissions by Sector (PCAF)")
+        financed_chart = cached_figure(
+            financed_emissions_chart,
+            financed.groupby(["Sector", "Asset_Class"], as_index=False)["Financed_Emissions_tons"].sum(),
+        )
+        st.plotly_chart(financed_chart, use_container_width=True)
+        st.subheader("Financed Emissions by Owner")
+        st.dataframe(
+            financed.groupby("Owner", as_index=False)[["Financed_Emissions_tons", "Outstanding_USD"]].sum()
+            .sort_values("Financed_Emissions_tons", ascending=False),
+            hide_index=True,
+        )
+
     # 2.2 Comparison to Targets
     st.header("Progress Toward Targets")
-    progress_chart = px.bar(
-        emissions_data,
-        x="Category",
-        y=["Emissions 2024 (tons CO₂)", "Target 2030 (tons CO₂)"],
-        title="Emissions vs. Targets",
-        barmode="group",
-        labels={"value": "Tons CO₂", "variable": "Type"},
-        height=600
-    )
+    progress_chart = cached_figure(emissions_progress_chart, emissions_data)
     st.plotly_chart(progress_chart, use_container_width=True)
 
     # 2.3 Path to Net Zero
     st.header("Path to Net Zero")
-    tasks = pd.DataFrame({
-        "Task": [
-            "Achieve zero deforestation in financed projects",
-            "Engage 80% of staff in sustainability training",
-            "Transition all data centers to renewable energy",
-            "Expand green financing portfolio by 40%",
-            "Implement supplier ESG audits for top 50 suppliers",
-            "Achieve 25% waste reduction in operations",
-            "Conduct water usage audits and reduce consumption by 20%",
-            "Achieve 100% digital communication and reduce printing by 90%",
-            "Replace 60% of company vehicles with electric vehicles",
-            "Increase renewable energy usage to 50%",
-            "Implement circular economy practices in office operations",
-            "Offset 100% of unavoidable emissions through verified carbon offsets",
-            "Retrofit all office buildings for energy efficiency"
-        ],
-        "Deadline": pd.date_range(start="2023-01-01", periods=13, freq="2Y").strftime("%Y-%m-%d"),  # Changed '2A' to '2Y'
-        "Completion (%)": [20, 45, 15, 35, 50, 30, 25, 80, 10, 40, 20, 5, 15],
-        "Owner": [
-            "Finance", "HR", "IT Department", "Sustainability Team", "Sustainability Team", "Operations", "Finance",
-            "IT Department", "Operations", "Sustainability Team", "HR", "Legal", "Sustainability Team"
-        ]
-    })
+    tasks = get_dataset("net_zero_tasks")
     st.subheader("Tasks Supporting the Path to Net Zero")
     st.dataframe(tasks)
 
     st.header("Net Zero Path Timeline")
-    scatter_chart = px.scatter(
-        tasks,
-        x="Deadline",
-        y="Task",
-        size="Completion (%)",
-        color="Owner",
-        title="Net Zero Path Timeline",
-        labels={"Deadline": "Timeline", "Task": "Tasks", "Completion (%)": "Completion (%)"},
-        height=600
-    )
-    scatter_chart.update_traces(marker=dict(symbol="circle", opacity=0.8))
-    scatter_chart.update_layout(xaxis_title="Timeline", yaxis_title="Tasks", showlegend=True)
+    scatter_chart = cached_figure(net_zero_timeline_chart, tasks)
     st.plotly_chart(scatter_chart, use_container_width=True)
 
+    # Required reduction paths from 2024 emissions to the 2030 targets
+    st.subheader("Trajectories to the 2030 Targets")
+    trend_rate = st.slider("Current Annual Reduction Trend (%):", 0.0, 30.0, 5.0, 0.5)
+    trajectories = project_trajectories(
+        emissions_data["Category"],
+        emissions_data["Emissions 2024 (tons CO₂)"],
+        emissions_data["Target 2030 (tons CO₂)"],
+        trend_rate / 100,
+    )
+    misses = trajectories.summary[trajectories.summary["Misses Target"]]
+    if misses.empty:
+        st.success(f"At {trend_rate}% a year every category reaches its 2030 target.")
+    else:
+        st.warning(f"At {trend_rate}% a year, {len(misses)} of {len(trajectories.summary)} categories miss their 2030 target.")
+    st.dataframe(trajectories.summary.round(1), hide_index=True)
+
+    trajectory_chart = cached_figure(
+        emissions_trajectory_chart,
+        pd.DataFrame({
+            "Year": trajectories.years,
+            "Linear Path": trajectories.linear.sum(axis=0),
+            "Compound Path": trajectories.compound.sum(axis=0),
+            f"Current Trend ({trend_rate}%/yr)": trajectories.trend.sum(axis=0),
+        }).melt(id_vars="Year", var_name="Path", value_name="Tons CO₂"),
+    )
+    st.plotly_chart(trajectory_chart, use_container_width=True)
+
     # 2.4 Decision-Making Tool (Slider for Reductions)
     st.header("Decision-Making Tool")
     st.write("Use the sliders below to explore different scenarios for emissions reduction.")
@@ -235,12 +336,8 @@ elif page == "Portfolio Carbon Analysis":
         st.write(f"- Target Emissions (2030): {target_emissions} tons CO₂")
         st.write(f"- Emissions after {reduction}% reduction: {reduced_emissions:.2f} tons CO₂")
 
-        reduction_chart = px.bar(
-            x=["Current Emissions", f"{reduction}% Reduction Target", "Target 2030"],
-            y=[current_emissions, reduced_emissions, target_emissions],
-            title=f"Reduction Impact for {sector}",
-            labels={"x": "Scenario", "y": "Emissions (tons CO₂)"},
-            height=400
+        reduction_chart = cached_figure(
+            reduction_impact_chart, sector, reduction, current_emissions, reduced_emissions, target_emissions
         )
         st.plotly_chart(reduction_chart, use_container_width=True)
     except IndexError:
@@ -257,66 +354,19 @@ elif page == "Compliance & Regulatory":
 
     # --- 3.1 Regulatory Compliance Overview ---
     st.header("Regulatory Compliance")
-    compliance_data = pd.DataFrame({
-        "Regulation": [
-            "Proper Conduct of Banking Business Directive 345",
-            "Net Zero 2050 (NGFS Scenarios)",
-            "EU Green Taxonomy",
-            "Corporate Sustainability Reporting Directive (CSRD)",
-            "Task Force on Climate-related Financial Disclosures (TCFD)",
-            "Israeli Securities Authority ESG Reporting"
-        ],
-        "Requirement": [
-            "Climate risk disclosures and portfolio analysis",
-            "Alignment with international climate targets",
-            "Classification of green finance activities",
-            "Mandatory sustainability reporting",
-            "Risk assessment for climate change impacts",
-            "Disclosure of ESG-related activities and goals"
-        ],
-        "Status": ["In Progress", "Completed", "In Progress", "Not Started", "Completed", "In Progress"],
-        "Deadline": ["2025-12-31", "2023-12-31", "2024-06-30", "2025-12-31", "2023-12-31", "2024-12-31"],
-        "Owner": ["Risk Management", "Sustainability Team", "Finance", "Legal", "Sustainability Team", "Legal"]
-    })
+    compliance_data = get_dataset("compliance")
     st.dataframe(compliance_data)
 
     # --- 3.2 Beyond Compliance Initiatives ---
     st.header("Beyond Compliance Initiatives")
-    beyond_compliance_data = pd.DataFrame({
-        "Initiative": [
-            "Allocate NIS 35 billion to green financing by 2030",
-            "Reduce operational emissions by 20% by 2030",
-            "Achieve 100% digital communication by 2024",
-            "Transition all data centers to renewable energy by 2035",
-            "Retrofit office buildings for energy efficiency by 2028",
-            "Offset 100% of unavoidable emissions by 2040",
-            "Sustainability-linked loans totaling NIS 1.48 billion",
-            "Facilitate ESG-focused investment products"
-        ],
-        "Target Year": [2030, 2030, 2024, 2035, 2028, 2040, 2023, 2023],
-        "Completion (%)": [45, 20, 80, 15, 25, 5, 100, 100],
-        "Owner": [
-            "Finance", "Sustainability Team", "IT Department", "IT Department",
-            "Operations", "Legal", "Finance", "Finance"
-        ]
-    })
+    beyond_compliance_data = get_dataset("beyond_compliance")
     st.dataframe(beyond_compliance_data)
 
     # --- 3.3 Radar/Pentagon Chart: Bank vs International Regulation ---
     st.header("Bank vs. International Regulatory Alignment (Radar Chart)")
     st.write("Visualize Bank Leumi’s alignment scores across multiple regulations/frameworks in a pentagon-style chart.")
 
-    radar_df = pd.DataFrame({
-        "Guideline": [
-            "TCFD", 
-            "EU Green Taxonomy", 
-            "CSRD", 
-            "IFRS S2", 
-            "Net Zero 2050"
-        ],
-        "Bank Leumi (%)": [85, 70, 65, 75, 80],
-        "International Best Practice (%)": [90, 85, 80, 85, 90],
-    })
+    radar_df = get_dataset("regulatory_alignment")
     # Melt the data for Plotly
     radar_melted = radar_df.melt(
         id_vars=["Guideline"], 
@@ -324,16 +374,7 @@ elif page == "Compliance & Regulatory":
         value_name="Score"
     )
 
-    radar_chart = px.line_polar(
-        radar_melted,
-        r="Score",
-        theta="Guideline",
-        color="Entity",
-        line_close=True,
-        title="Radar Chart: Bank Leumi vs International Best Practices",
-        range_r=[0, 100],  # ensures 0-100 scale
-        height=600
-    )
+    radar_chart = cached_figure(regulatory_radar_chart, radar_melted)
     st.plotly_chart(radar_chart, use_container_width=True)
 
     display_footer()
@@ -352,47 +393,74 @@ elif page == "Financial Analysis":
     st.header("Carbon Pricing & Tax Scenarios")
     st.write("Analyze the potential cost impact of various carbon tax rates on Bank Leumi’s emissions.")
 
-    # Example simple slider for carbon tax
+    # The whole price x country x scope cube is precomputed; the slider only indexes into it
+    exposure = get_carbon_exposure()
     carbon_tax_rate = st.slider("Select Carbon Tax Rate (USD/ton CO₂)", 0, 200, 50)
-    # Example total bank emissions (Scope 1 + 2) just as a placeholder
-    total_scope_1_2_emissions = 30000  # adjust as needed (in tons CO₂)
-
-    estimated_cost = total_scope_1_2_emissions * carbon_tax_rate
-    st.write(f"**Estimated Annual Carbon Tax**: ${estimated_cost:,.0f} at {carbon_tax_rate} USD/ton")
+    if exposure.countries:
+        country = st.selectbox("Select Jurisdiction:", exposure.countries)
+        costs = exposure.at(carbon_tax_rate).loc[country]
+        scope_1_2 = costs.reindex(["Scope 1", "Scope 2"]).fillna(0)
+        st.write(f"**Estimated Annual Carbon Tax (Scope 1 + 2)**: ${scope_1_2.sum():,.0f} at {carbon_tax_rate} USD/ton in {country}")
+        st.write(f"**Including Scope 3**: ${costs.sum():,.0f}")
+
+        curve = exposure.curve(country).reset_index().melt(
+            id_vars="Carbon Price (USD/ton)", var_name="Scope", value_name="Annual Cost (USD)"
+        )
+        fig = cached_figure(carbon_exposure_chart, curve, country, carbon_tax_rate)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.warning("No country carbon prices available in data/public_data.csv.")
 
     # 4.2 CAPEX vs. OPEX for Key ESG Projects
     st.header("Capital & Operating Expenditure (CAPEX/OPEX) for ESG Projects")
-    projects_data = pd.DataFrame({
-        "Project": ["Office Retrofit", "EV Fleet Transition", "Renewable Data Centers"],
-        "CAPEX (NIS millions)": [35, 50, 75],
-        "Annual OPEX Savings (NIS millions)": [5, 8, 15],
-        "Payback (Years)": [7, 6, 5]
-    })
-    st.dataframe(projects_data)
+    projects_data = get_dataset("esg_projects")
+    # Payback is computed in 4.3; the static column would contradict it
+    st.dataframe(projects_data.drop(columns=["Payback (Years)"]))
 
     # Simple bar chart to visualize CAPEX
-    capex_chart = px.bar(
-        projects_data,
-        x="Project",
-        y="CAPEX (NIS millions)",
-        title="CAPEX for Major ESG Projects",
-        height=400
-    )
+    capex_chart = cached_figure(project_capex_chart, projects_data)
     st.plotly_chart(capex_chart, use_container_width=True)
 
-    # 4.3 ROI/NPV Calculations (Illustrative)
-    st.header("Estimated ROI/NPV (Illustrative)")
+    # 4.3 NPV/IRR/Payback across discount rates and carbon price paths
+    st.header("NPV, IRR & Payback Sensitivity")
     st.write(
-        "Below is a hypothetical ROI calculation for each project, assuming a discount rate of 5%. "
-        "Adapt this to real data for precise analysis."
+        "Cash flows are each project's annual OPEX savings plus its avoided CO₂ valued at a carbon price path, "
+        "over the project lifetime. Every project × discount rate × price path is evaluated at once."
+    )
+    assumptions = get_dataset("esg_project_assumptions")
+    with st.expander("Assumptions (illustrative)"):
+        st.dataframe(assumptions)
+    missing = assumptions.loc[assumptions["Lifetime (Years)"].isna(), "Project"]
+    if not missing.empty:
+        st.caption(f"No lifetime given for {', '.join(missing)}; {DEFAULT_LIFETIME} years assumed.")
+    rate_range = st.slider("Discount Rate Range (%)", 0.0, 20.0, (2.0, 12.0), 0.5)
+    returns = evaluate_projects(
+        projects_data.merge(assumptions, on="Project"),
+        np.arange(rate_range[0], rate_range[1] + 0.25, 0.5) / 100
     )
-    # We'll just show them as made-up values
-    roi_data = pd.DataFrame({
-        "Project": ["Office Retrofit", "EV Fleet Transition", "Renewable Data Centers"],
-        "ROI (%)": [12, 15, 20],
-        "NPV (NIS millions)": [10, 15, 30]
-    })
-    st.table(roi_data)
+    path = st.selectbox("Carbon Price Path:", [price_path.name for price_path in DEFAULT_PRICE_PATHS], index=2)
+    selected_returns = returns[returns["Carbon Price Path"] == path]
+
+    npv_table = selected_returns.pivot(index="Project", columns="Discount Rate", values="NPV (NIS millions)")
+    npv_table.columns = [f"{rate:.1%}" for rate in npv_table.columns]
+    st.subheader("NPV (NIS millions) by Discount Rate")
+    st.dataframe(npv_table.style.format("{:,.1f}"))
+
+    summary_rates = sorted(selected_returns["Discount Rate"].unique())
+    if len(summary_rates) > 1:
+        summary_rate = st.select_slider("Discount Rate for Payback:", options=summary_rates, format_func="{:.1%}".format)
+    elif summary_rates:
+        summary_rate = summary_rates[0]
+        st.caption(f"Payback at a {summary_rate:.1%} discount rate.")
+    else:
+        summary_rate = None
+        st.warning("No project has assumptions to evaluate.")
+    if summary_rate is not None:
+        st.table(
+            selected_returns[selected_returns["Discount Rate"] == summary_rate]
+            .set_index("Project")[["NPV (NIS millions)", "IRR (%)", "Discounted Payback (Years)"]]
+            .round(1)
+        )
 
     display_footer()
 
@@ -415,18 +483,7 @@ elif page == "Decision Support Tools":
         "Below is a snapshot of crucial ESG metrics aligned with Bank Leumi’s strategy "
         "and global benchmarks (TCFD, SASB, IFRS S2)."
     )
-    kpi_data = pd.DataFrame({
-        "KPI": [
-            "Carbon Intensity (kg CO₂e / million NIS assets)", 
-            "Green Financing Volume (NIS billions)",
-            "Renewable Energy in Operations (%)",
-            "Female Representation in Management (%)",
-            "Supplier ESG Compliance Rate (%)"
-        ],
-        "Current Value": [320, 18, 25, 40, 60],
-        "2025 Target": [250, 25, 40, 45, 75],
-        "2030 Target": [150, 40, 80, 50, 90]
-    })
+    kpi_data = get_dataset("esg_kpis")
     st.table(kpi_data)
     
     # 5.2 Scenario Modeling Example
@@ -457,21 +514,7 @@ elif page == "Decision Support Tools":
         recommended stakeholders and potential roles.
         """
     )
-    stakeholders = pd.DataFrame({
-        "Stakeholder": [
-            "Risk Management", "Finance", "HR", "IT Department", 
-            "Operations", "Regulators", "NGOs/Civil Society"
-        ],
-        "Role": [
-            "Evaluate and integrate climate risks into credit decisions",
-            "Structure green financing instruments, measure ROI of ESG",
-            "Oversee employee engagement/training on ESG topics",
-            "Implement technology solutions for ESG data and monitoring",
-            "Optimize resource use (energy, water, waste) in daily operations",
-            "Provide regulatory guidelines and oversight on ESG disclosures",
-            "Offer independent insights on community/environmental needs"
-        ]
-    })
+    stakeholders = get_dataset("stakeholders")
     st.table(stakeholders)
     
     # 5.4 Recommended Actions (Best Practices from Global Banks)
@@ -542,16 +585,7 @@ elif page == "KPI Metrics Overview":
                 value_name="Value"
             )
 
-            kpi_chart = px.bar(
-                kpi_melted,
-                x="KPI",
-                y="Value",
-                color="Year",
-                barmode="group",
-                title="KPI Progress Towards Targets",
-                labels={"Value": "Value", "KPI": "Key Performance Indicator"},
-                height=600
-            )
+            kpi_chart = cached_figure(kpi_progress_chart, kpi_melted)
             st.plotly_chart(kpi_chart, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating KPI progress chart: {e}")
@@ -561,30 +595,10 @@ elif page == "KPI Metrics Overview":
     # --- 3. KPI Trend Over Time ---
     st.header("KPI Trend Over Time")
     # Example trend data (for illustrative purposes)
-    trend_data = pd.DataFrame({
-        "Year": [2020, 2021, 2022, 2023, 2024, 2025, 2030],
-        "Carbon Intensity (kg CO₂e / million NIS assets)": [400, 350, 330, 320, 300, 250, 150],
-        "Green Financing Volume (NIS billions)": [10, 12, 15, 16, 18, 25, 40],
-        "Renewable Energy in Operations (%)": [10, 15, 18, 20, 25, 40, 80],
-        "Female Representation in Management (%)": [30, 35, 38, 40, 42, 45, 50],
-        "Supplier ESG Compliance Rate (%)": [50, 55, 58, 60, 65, 75, 90]
-    })
+    trend_data = get_dataset("kpi_trend")
     
     try:
-        trend_chart = px.line(
-            trend_data,
-            x="Year",
-            y=[
-                "Carbon Intensity (kg CO₂e / million NIS assets)", 
-                "Green Financing Volume (NIS billions)",
-                "Renewable Energy in Operations (%)",
-                "Female Representation in Management (%)",
-                "Supplier ESG Compliance Rate (%)"
-            ],
-            title="KPI Trend Over Time",
-            labels={"Value": "Value", "Year": "Year"},
-            height=600
-        )
+        trend_chart = cached_figure(kpi_trend_chart, trend_data)
         st.plotly_chart(trend_chart, use_container_width=True)
     except Exception as e:
         st.error(f"Error creating KPI trend chart: {e}")
@@ -592,18 +606,7 @@ elif page == "KPI Metrics Overview":
     # --- 4. KPI Comparison to Industry Benchmarks ---
     st.header("KPI Comparison to Industry Benchmarks")
     # Example benchmark data
-    benchmark_data = pd.DataFrame({
-        "KPI": [
-            "Carbon Intensity (kg CO₂e / million NIS assets)", 
-            "Green Financing Volume (NIS billions)",
-            "Renewable Energy in Operations (%)",
-            "Female Representation in Management (%)",
-            "Supplier ESG Compliance Rate (%)"
-        ],
-        "Bank Leumi": [250, 25, 40, 45, 75],
-        "Industry Average": [300, 20, 35, 40, 70],
-        "Best in Class": [150, 40, 80, 50, 90]
-    })
+    benchmark_data = get_dataset("kpi_benchmark")
     st.table(benchmark_data)
 
     try:
@@ -613,34 +616,14 @@ elif page == "KPI Metrics Overview":
             value_name="Value"
         )
         
-        benchmark_chart = px.bar(
-            benchmark_melted,
-            x="KPI",
-            y="Value",
-            color="Entity",
-            barmode="group",
-            title="KPI Comparison to Industry Benchmarks",
-            labels={"Value": "Value", "KPI": "Key Performance Indicator"},
-            height=600
-        )
+        benchmark_chart = cached_figure(kpi_benchmark_chart, benchmark_melted)
         st.plotly_chart(benchmark_chart, use_container_width=True)
     except Exception as e:
         st.error(f"Error creating KPI comparison chart: {e}")
 
     # --- 5. Summary of KPI Achievements ---
     st.header("Summary of KPI Achievements")
-    summary_data = pd.DataFrame({
-        "KPI": [
-            "Carbon Intensity Reduction",
-            "Increase in Green Financing",
-            "Expansion of Renewable Energy Use",
-            "Growth in Female Management",
-            "Enhancement of Supplier ESG Compliance"
-        ],
-        "Status": [
-            "On Track", "Achieved 2025 Target", "Behind Schedule", "On Track", "Achieved 2025 Target"
-        ]
-    })
+    summary_data = get_dataset("kpi_summary")
     st.table(summary_data)
 
     # --- 6. AI-Generated Summary (Optional) ---
@@ -0,0 +1,392 @@
+# leumi_datasets.py
+
+from dataclasses import dataclass
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.financed_emissions import compute_financed_emissions, loan_book_version
+from utils.helpers import dataset_fingerprint, load_csv
+from utils.rollups import completion_buckets
+
+# A data/leumi/<name>.csv file replaces the built-in table of the same name.
+OVERRIDE_DIR = os.path.join("data", "leumi")
+
+# Carbon tax levels (USD per ton) the exposure cube is evaluated at
+CARBON_PRICES = np.arange(0, 201)
+PUBLIC_DATA = os.path.join("data", "public_data.csv")
+
+# Tables shared by leumi_app_openai.py, leumi_dashboard_updated.py and avi_leumi_dashpy.py.
+DATASETS = {
+    "emissions": {
+        "Scope": [
+            "Scope 1", "Scope 1", "Scope 2", "Scope 2", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3",
+            "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3",
+            "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3", "Scope 3"
+        ],
+        "Category": [
+            "Direct Emissions - Office Energy Use", "Direct Emissions - Company Vehicles",
+            "Indirect Energy Emissions - Purchased Electricity", "Indirect Energy Emissions - Cooling Systems",
+            "Financed Emissions - Corporate Loans", "Financed Emissions - Investments", "Business Travel",
+            "Supply Chain Emissions", "Data Centers", "Waste Management", "Office Supplies", "Outsourced Services",
+            "IT Equipment", "Marketing Activities", "Logistics Services", "Capital Goods", "Professional Services",
+            "Training Programs", "Food Services", "Printing Services", "Telecommunications", "Insurance Services",
+            "Legal Services", "Banking Services", "Cleaning Services", "Temporary Staffing"
+        ],
+        "Emissions 2024 (tons CO₂)": [
+            3049, 2542, 1698, 3958, 1975, 3799, 2892, 3956, 3294, 2239,
+            4523, 3783, 556, 1688, 4327, 2853, 1442, 4102, 3541, 3150,
+            3449, 4282, 4126, 1486, 2226, 3601
+        ],
+        "Target 2030 (tons CO₂)": [
+            1328, 670, 729, 855, 1224, 1965, 1105, 1542, 1186, 1206,
+            2320, 1550, 259, 949, 2316, 1362, 857, 1935, 1038, 747,
+            207, 79, 819, 1068, 1458, 2746
+        ],
+        "% of Target": [
+            0.5644, 0.7364, 0.5707, 0.7840, 0.3803, 0.4828, 0.6179, 0.6102, 0.6400, 0.4614,
+            0.4871, 0.5903, 0.5342, 0.4378, 0.4648, 0.5226, 0.4057, 0.5283, 0.7069, 0.7629,
+            0.9400, 0.9820, 0.8015, 0.2813, 0.3450, 0.2374
+        ],
+        "Owner": [
+            "Finance", "Legal", "Finance", "Legal", "IT Department", "HR", "Legal", "Finance", "HR", "Finance",
+            "Legal", "HR", "HR", "Sustainability Team", "Sustainability Team", "Operations", "Sustainability Team",
+            "IT Department", "Sustainability Team", "Operations", "Sustainability Team", "HR", "Sustainability Team",
+            "Operations", "Sustainability Team", "Finance"
+        ],
+    },
+    "net_zero_tasks": {
+        "Task": [
+            "Achieve zero deforestation in financed projects",
+            "Engage 80% of staff in sustainability training",
+            "Transition all data centers to renewable energy",
+            "Expand green financing portfolio by 40%",
+            "Implement supplier ESG audits for top 50 suppliers",
+            "Achieve 25% waste reduction in operations",
+            "Conduct water usage audits and reduce consumption by 20%",
+            "Achieve 100% digital communication and reduce printing by 90%",
+            "Replace 60% of company vehicles with electric vehicles",
+            "Increase renewable energy usage to 50%",
+            "Implement circular economy practices in office operations",
+            "Offset 100% of unavoidable emissions through verified carbon offsets",
+            "Retrofit all office buildings for energy efficiency"
+        ],
+        # Every second year-end from 2023, i.e. pd.date_range("2023-01-01", periods=13, freq="2YE")
+        "Deadline": [
+            "2023-12-31", "2025-12-31", "2027-12-31", "2029-12-31", "2031-12-31", "2033-12-31", "2035-12-31",
+            "2037-12-31", "2039-12-31", "2041-12-31", "2043-12-31", "2045-12-31", "2047-12-31"
+        ],
+        "Completion (%)": [20, 45, 15, 35, 50, 30, 25, 80, 10, 40, 20, 5, 15],
+        "Owner": [
+            "Finance", "HR", "IT Department", "Sustainability Team", "Sustainability Team", "Operations", "Finance",
+            "IT Department", "Operations", "Sustainability Team", "HR", "Legal", "Sustainability Team"
+        ],
+    },
+    "compliance": {
+        "Regulation": [
+            "Proper Conduct of Banking Business Directive 345",
+            "Net Zero 2050 (NGFS Scenarios)",
+            "EU Green Taxonomy",
+            "Corporate Sustainability Reporting Directive (CSRD)",
+            "Task Force on Climate-related Financial Disclosures (TCFD)",
+            "Israeli Securities Authority ESG Reporting"
+        ],
+        "Requirement": [
+            "Climate risk disclosures and portfolio analysis",
+            "Alignment with international climate targets",
+            "Classification of green finance activities",
+            "Mandatory sustainability reporting",
+            "Risk assessment for climate change impacts",
+            "Disclosure of ESG-related activities and goals"
+        ],
+        "Status": ["In Progress", "Completed", "In Progress", "Not Started", "Completed", "In Progress"],
+        "Deadline": ["2025-12-31", "2023-12-31", "2024-06-30", "2025-12-31", "2023-12-31", "2024-12-31"],
+        "Owner": ["Risk Management", "Sustainability Team", "Finance", "Legal", "Sustainability Team", "Legal"],
+    },
+    "beyond_compliance": {
+        "Initiative": [
+            "Allocate NIS 35 billion to green financing by 2030",
+            "Reduce operational emissions by 20% by 2030",
+            "Achieve 100% digital communication by 2024",
+            "Transition all data centers to renewable energy by 2035",
+            "Retrofit office buildings for energy efficiency by 2028",
+            "Offset 100% of unavoidable emissions by 2040",
+            "Sustainability-linked loans totaling NIS 1.48 billion",
+            "Facilitate ESG-focused investment products"
+        ],
+        "Target Year": [2030, 2030, 2024, 2035, 2028, 2040, 2023, 2023],
+        "Completion (%)": [45, 20, 80, 15, 25, 5, 100, 100],
+        "Owner": [
+            "Finance", "Sustainability Team", "IT Department", "IT Department",
+            "Operations", "Legal", "Finance", "Finance"
+        ],
+    },
+    "regulatory_alignment": {
+        "Guideline": [
+            "TCFD", 
+            "EU Green Taxonomy", 
+            "CSRD", 
+            "IFRS S2", 
+            "Net Zero 2050"
+        ],
+        "Bank Leumi (%)": [85, 70, 65, 75, 80],
+        "International Best Practice (%)": [90, 85, 80, 85, 90],
+    },
+    "climate_risk_comparison": {
+        "Risk Type": ["Physical", "Transition", "Liability"],
+        "Bank Leumi Score": [75, 65, 50],
+        "EU Benchmark": [80, 70, 60],
+        "ECB Compliance (%)": [85, 75, 65],
+        "Alignment with TCFD (%)": [90, 80, 70],
+    },
+    "compliance_tasks": {
+        "Task": [
+            "Conduct climate scenario analysis for credit portfolio",
+            "Implement flood and heat risk assessments for real estate collateral",
+            "Develop ESG-focused investment products",
+            "Expand sustainability-linked loans by 10% annually",
+            "Increase procurement of renewable energy for operations",
+            "Complete office energy retrofitting by 2028",
+            "Enhance ESG reporting transparency by 2024",
+            "Introduce climate risk mitigation training for staff"
+        ],
+        "Deadline": [
+            "2024-06-30", "2025-12-31", "2023-12-31", "2024-12-31",
+            "2025-12-31", "2028-12-31", "2024-12-31", "2023-12-31"
+        ],
+        "Status": [
+            "In Progress", "Not Started", "Completed", "In Progress",
+            "In Progress", "Not Started", "In Progress", "Completed"
+        ],
+        "Owner": [
+            "Risk Management", "Risk Management", "Finance", "Finance",
+            "Operations", "Operations", "Sustainability Team", "HR"
+        ],
+    },
+    "esg_projects": {
+        "Project": ["Office Retrofit", "EV Fleet Transition", "Renewable Data Centers"],
+        "CAPEX (NIS millions)": [35, 50, 75],
+        "Annual OPEX Savings (NIS millions)": [5, 8, 15],
+        "Payback (Years)": [7, 6, 5],
+    },
+    # Illustrative inputs for the NPV/IRR engine (utils.cashflows), not reported figures
+    "esg_project_assumptions": {
+        "Project": ["Office Retrofit", "EV Fleet Transition", "Renewable Data Centers"],
+        "Lifetime (Years)": [20, 10, 25],
+        "Annual CO₂ Avoided (tons)": [1200, 2500, 6000],
+    },
+    "project_returns": {
+        "Project": ["Office Retrofit", "EV Fleet Transition", "Renewable Data Centers"],
+        "ROI (%)": [12, 15, 20],
+        "NPV (NIS millions)": [10, 15, 30],
+    },
+    "esg_kpis": {
+        "KPI": [
+            "Carbon Intensity (kg CO₂e / million NIS assets)", 
+            "Green Financing Volume (NIS billions)",
+            "Renewable Energy in Operations (%)",
+            "Female Representation in Management (%)",
+            "Supplier ESG Compliance Rate (%)"
+        ],
+        "Current Value": [320, 18, 25, 40, 60],
+        "2025 Target": [250, 25, 40, 45, 75],
+        "2030 Target": [150, 40, 80, 50, 90],
+    },
+    "stakeholders": {
+        "Stakeholder": [
+            "Risk Management", "Finance", "HR", "IT Department", 
+            "Operations", "Regulators", "NGOs/Civil Society"
+        ],
+        "Role": [
+            "Evaluate and integrate climate risks into credit decisions",
+            "Structure green financing instruments, measure ROI of ESG",
+            "Oversee employee engagement/training on ESG topics",
+            "Implement technology solutions for ESG data and monitoring",
+            "Optimize resource use (energy, water, waste) in daily operations",
+            "Provide regulatory guidelines and oversight on ESG disclosures",
+            "Offer independent insights on community/environmental needs"
+        ],
+    },
+    "kpi_trend": {
+        "Year": [2020, 2021, 2022, 2023, 2024, 2025, 2030],
+        "Carbon Intensity (kg CO₂e / million NIS assets)": [400, 350, 330, 320, 300, 250, 150],
+        "Green Financing Volume (NIS billions)": [10, 12, 15, 16, 18, 25, 40],
+        "Renewable Energy in Operations (%)": [10, 15, 18, 20, 25, 40, 80],
+        "Female Representation in Management (%)": [30, 35, 38, 40, 42, 45, 50],
+        "Supplier ESG Compliance Rate (%)": [50, 55, 58, 60, 65, 75, 90],
+    },
+    "kpi_benchmark": {
+        "KPI": [
+            "Carbon Intensity (kg CO₂e / million NIS assets)", 
+            "Green Financing Volume (NIS billions)",
+            "Renewable Energy in Operations (%)",
+            "Female Representation in Management (%)",
+            "Supplier ESG Compliance Rate (%)"
+        ],
+        "Bank Leumi": [250, 25, 40, 45, 75],
+        "Industry Average": [300, 20, 35, 40, 70],
+        "Best in Class": [150, 40, 80, 50, 90],
+    },
+    "kpi_summary": {
+        "KPI": [
+            "Carbon Intensity Reduction",
+            "Increase in Green Financing",
+            "Expansion of Renewable Energy Use",
+            "Growth in Female Management",
+            "Enhancement of Supplier ESG Compliance"
+        ],
+        "Status": [
+            "On Track", "Achieved 2025 Target", "Behind Schedule", "On Track", "Achieved 2025 Target"
+        ],
+    },
+}
+
+_built = {}
+_build_lock = threading.Lock()
+
+def get_dataset(name):
+    """
+    Returns a dashboard table. Built-in tables are built once per process and
+    shared by every session; an override file goes through load_csv's cache.
+    """
+    override = os.path.join(OVERRIDE_DIR, f"{name}.csv")
+    if os.path.exists(override):
+        df = load_csv(override)
+    else:
+        df = _built.get(name)
+        if df is None:
+            with _build_lock:
+                df = _built.get(name)
+                if df is None:
+                    df = _built[name] = pd.DataFrame(DATASETS[name])
+    if name == "emissions":
+        df = _with_financed_emissions(df, _source_version(name))
+    # Copy-on-write view: callers may add columns without touching the shared frame
+    return df.copy(deep=False)
+
+# Emissions rows computed from the loan book (see utils.financed_emissions) when there is one
+FINANCED_CATEGORIES = {
+    "Corporate Loans": "Financed Emissions - Corporate Loans",
+    "Investments": "Financed Emissions - Investments",
+}
+_financed = {}
+
+def _with_financed_emissions(emissions, source_version):
+    """
+    Replaces the financed-emissions rows of the emissions table with the
+    totals attributed from data/loan_book.csv, once per loan book version.
+    """
+    version = loan_book_version()
+    if version is None:
+        return emissions
+    key = (source_version, version)
+    df = _financed.get(key)
+    if df is None:
+        by_class = compute_financed_emissions().groupby("Asset_Class")["Financed_Emissions_tons"].sum()
+        df = emissions.copy()
+        for asset_class, category in FINANCED_CATEGORIES.items():
+            rows = df["Category"] == category
+            financed = round(float(by_class.get(asset_class, 0.0)))
+            target = df.loc[rows, "Target 2030 (tons CO₂)"]
+            df.loc[rows, "Emissions 2024 (tons CO₂)"] = financed
+            df.loc[rows, "% of Target"] = (1 - target / financed).round(4) if financed else 0.0
+        _financed.clear()
+        _financed[key] = df
+    return df
+
+_summaries = {}
+
+def _source_version(name):
+    override = os.path.join(OVERRIDE_DIR, f"{name}.csv")
+    return dataset_fingerprint(override) if os.path.exists(override) else "built-in"
+
+def _version(name):
+    if name == "emissions":
+        return (_source_version(name), loan_book_version())
+    return _source_version(name)
+
+def get_compliance_summary():
+    """
+    Returns the Overall Compliance Progress table. It is aggregated once per
+    version of the compliance and beyond_compliance tables, not per rerun.
+    """
+    compliance = get_dataset("compliance")
+    beyond_compliance = get_dataset("beyond_compliance")
+    key = (_version("compliance"), _version("beyond_compliance"))
+    summary = _summaries.get(key)
+    if summary is None:
+        status_counts = compliance["Status"].value_counts()
+        buckets = completion_buckets(beyond_compliance["Completion (%)"])
+        summary = pd.DataFrame({
+            "Track": ["Regulatory Compliance", "Beyond Compliance Initiatives"],
+            "Total Tasks": [len(compliance), len(beyond_compliance)],
+            "Completed": [status_counts.get("Completed", 0), buckets["Completed"]],
+            "In Progress": [status_counts.get("In Progress", 0), buckets["In Progress"]],
+            "Not Started": [status_counts.get("Not Started", 0), buckets["Not Started"]],
+        })
+        _summaries.clear()
+        _summaries[key] = summary
+    return summary.copy(deep=False)
+
+@dataclass(frozen=True)
+class CarbonExposure:
+    """
+    Annual carbon cost of the bank's emissions for every price in
+    CARBON_PRICES, country in public_data.csv and emissions scope.
+    cube[p, c, s] is the cost in USD of scope s in country c when a carbon
+    tax of prices[p] applies, never below that country's existing tax.
+    """
+    prices: np.ndarray
+    countries: tuple
+    scopes: tuple
+    emissions: np.ndarray
+    cube: np.ndarray
+
+    def at(self, price):
+        """
+        Returns the countries x scopes cost table at a price: an index lookup.
+        """
+        index = int(np.clip(np.searchsorted(self.prices, price), 0, len(self.prices) - 1))
+        return pd.DataFrame(self.cube[index], index=pd.Index(self.countries, name="Country"), columns=list(self.scopes))
+
+    def curve(self, country):
+        """
+        Returns the cost of each scope over the whole price range for one country.
+        """
+        costs = self.cube[:, self.countries.index(country), :]
+        return pd.DataFrame(costs, index=pd.Index(self.prices, name="Carbon Price (USD/ton)"), columns=list(self.scopes))
+
+_exposures = {}
+
+def get_carbon_exposure():
+    """
+    Returns the CarbonExposure cube, built in one broadcast from the emissions
+    table and the country prices in data/public_data.csv. It is rebuilt only
+    when one of them changes, so a price slider only indexes into it.
+    """
+    emissions_data = get_dataset("emissions")
+    public_data = load_csv(PUBLIC_DATA)
+    key = (_version("emissions"), dataset_fingerprint(PUBLIC_DATA))
+    exposure = _exposures.get(key)
+    if exposure is None:
+        by_scope = emissions_data.groupby("Scope")["Emissions 2024 (tons CO₂)"].sum()
+        if public_data.empty:
+            countries, existing_tax = (), np.empty(0)
+        else:
+            countries = tuple(public_data["Country"].astype(str))
+            existing_tax = public_data["Carbon_Tax_USD_per_ton"].fillna(0).to_numpy(dtype=float)
+        # prices x countries effective rate, then x scopes emissions
+        rates = np.maximum(CARBON_PRICES[:, np.newaxis], existing_tax[np.newaxis, :])
+        emissions = by_scope.to_numpy(dtype=float)
+        exposure = CarbonExposure(
+            prices=CARBON_PRICES,
+            countries=countries,
+            scopes=tuple(by_scope.index),
+            emissions=emissions,
+            cube=rates[:, :, np.newaxis] * emissions[np.newaxis, np.newaxis, :],
+        )
+        _exposures.clear()
+        _exposures[key] = exposure
+    return exposure
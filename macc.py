@@ -0,0 +1,106 @@
+# utils/macc.py
+
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+
+def capital_recovery_factor(rate, lifetime):
+    """
+    Share of an upfront cost paid each year when it is spread over lifetime
+    years at the given discount rate.
+    """
+    if rate == 0:
+        return 1.0 / lifetime
+    growth = (1 + rate) ** lifetime
+    return rate * growth / (growth - 1)
+
+class MaccCurve:
+    """
+    Marginal abatement cost curve: measures sorted by annualised cost per ton
+    of CO2 avoided, each drawn as a bar as wide as its yearly abatement.
+    Measures can be inserted later without re-sorting the whole curve.
+    insert replaces the arrays rather than writing into them, so a shallow
+    copy can be extended while the original is still being read.
+    """
+
+    def __init__(self, rate=0.08, lifetime=10):
+        self.rate = rate
+        self.lifetime = lifetime
+        self.crf = capital_recovery_factor(rate, lifetime)
+        self.labels = np.empty(0, dtype=object)
+        self.cost_per_ton = np.empty(0)
+        self.tons = np.empty(0)
+        self.cumulative = np.empty(0)
+
+    def _measures(self, projects_df):
+        cost = projects_df['Estimated_Cost_USD'].to_numpy(dtype=float, na_value=np.nan)
+        tons = projects_df['Estimated_Carbon_Reduction_tons'].to_numpy(dtype=float, na_value=np.nan)
+        # Measures that abate nothing have no meaningful cost per ton
+        valid = np.isfinite(cost) & np.isfinite(tons) & (tons > 0)
+        labels = projects_df['Project'].astype(object).to_numpy()[valid]
+        return labels, cost[valid] * self.crf / tons[valid], tons[valid]
+
+    def insert(self, projects_df):
+        """
+        Adds measures to the curve. Each lands at its sorted position, and the
+        cumulative abatement is only recomputed from the first position that
+        moved.
+        """
+        labels, cost_per_ton, tons = self._measures(projects_df)
+        if not len(labels):
+            return self
+        order = np.argsort(cost_per_ton, kind="stable")
+        labels, cost_per_ton, tons = labels[order], cost_per_ton[order], tons[order]
+        positions = np.searchsorted(self.cost_per_ton, cost_per_ton, side="right")
+        self.labels = np.insert(self.labels, positions, labels)
+        self.cost_per_ton = np.insert(self.cost_per_ton, positions, cost_per_ton)
+        self.tons = np.insert(self.tons, positions, tons)
+
+        # The first new measure ends up exactly at its search position
+        start = int(positions[0])
+        offset = self.cumulative[start - 1] if start else 0.0
+        self.cumulative = np.concatenate((self.cumulative[:start], offset + np.cumsum(self.tons[start:])))
+        return self
+
+    def frame(self):
+        """
+        Returns the curve as one row per measure with Project, Cost_per_ton,
+        Abatement_tons and the left and right edges of its bar.
+        """
+        return pd.DataFrame({
+            "Project": self.labels,
+            "Cost_per_ton": self.cost_per_ton,
+            "Abatement_tons": self.tons,
+            "Start_tons": self.cumulative - self.tons,
+            "End_tons": self.cumulative,
+        })
+
+# Last curve per (rate, lifetime), with the row hashes of the table it was built from
+_CURVES = {}
+_curves_lock = threading.Lock()
+
+def get_macc(projects_df, rate=0.08, lifetime=10):
+    """
+    Returns the MaccCurve for a projects table. The curve is cached per
+    dataset version; when the new version only appends rows to the cached
+    one, just those rows are inserted into a copy instead of rebuilding the
+    curve. A cached curve is never changed once returned.
+    """
+    hashes = pd.util.hash_pandas_object(projects_df, index=False).to_numpy()
+    key = (rate, lifetime)
+    with _curves_lock:
+        cached = _CURVES.get(key)
+        if cached is not None:
+            curve, seen = cached
+            if len(seen) == len(hashes) and np.array_equal(seen, hashes):
+                return curve
+            if len(seen) < len(hashes) and np.array_equal(seen, hashes[:len(seen)]):
+                # Other sessions may be reading the cached curve; extend a copy
+                curve = copy.copy(curve).insert(projects_df.iloc[len(seen):])
+                _CURVES[key] = (curve, hashes)
+                return curve
+        curve = MaccCurve(rate, lifetime).insert(projects_df)
+        _CURVES[key] = (curve, hashes)
+        return curve
@@ -0,0 +1,222 @@
+# utils/portfolio.py
+
+from dataclasses import dataclass
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Project counts up to this are solved exactly with branch and bound
+EXACT_LIMIT = 40
+# Branch-and-bound nodes explored before settling for the best selection so far
+NODE_LIMIT = 200_000
+
+OBJECTIVES = ("carbon", "weighted")
+
+@dataclass(frozen=True)
+class Selection:
+    """
+    A chosen subset of projects. mask is aligned with the projects frame;
+    bound is an upper bound on the best achievable value, so bound - value
+    is how far from optimal the selection can be.
+    """
+    mask: np.ndarray
+    value: float
+    cost: float
+    bound: float
+    method: str
+
+def _scaled(values):
+    peak = np.nanmax(np.abs(values)) if np.isfinite(values).any() else 0
+    return values / peak if peak else values
+
+def project_values(projects_df, objective="carbon", roi_weight=0.5):
+    """
+    Returns the value of each project under an objective: its estimated
+    carbon reduction, or a blend of ROI and Priority_Score scaled to [0, 1].
+    """
+    if objective == "carbon":
+        return projects_df['Estimated_Carbon_Reduction_tons'].to_numpy(dtype=float, na_value=np.nan)
+    if objective == "weighted":
+        roi = projects_df['ROI_Percentage'].to_numpy(dtype=float, na_value=np.nan)
+        priority = projects_df['Priority_Score'].to_numpy(dtype=float, na_value=np.nan)
+        return roi_weight * _scaled(roi) + (1 - roi_weight) * _scaled(priority)
+    raise ValueError(f"Unknown objective {objective!r}; use one of {OBJECTIVES}")
+
+class PortfolioOptimizer:
+    """
+    Picks the projects that maximize total value under a budget, optionally
+    capping the spend of each department. The density ordering is computed
+    once, so moving the budget only reruns the selection itself, and every
+    budget already solved is answered from memory.
+    """
+
+    def __init__(self, costs, values, departments=None, quotas=None):
+        self.costs = np.asarray(costs, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        # Projects with missing numbers or no value are never worth picking
+        self.eligible = np.flatnonzero(
+            np.isfinite(self.costs) & np.isfinite(self.values) & (self.costs >= 0) & (self.values > 0)
+        )
+        density = self.values[self.eligible] / np.maximum(self.costs[self.eligible], 1e-12)
+        self.order = self.eligible[np.argsort(-density, kind="stable")]
+        self.prefix_costs = np.cumsum(self.costs[self.order])
+        self.prefix_values = np.cumsum(self.values[self.order])
+
+        quotas = {dept: cap for dept, cap in (quotas or {}).items() if cap is not None}
+        if quotas and departments is not None:
+            codes, labels = pd.factorize(pd.Series(departments).astype(object))
+            self.department_codes = codes
+            self.caps = np.array([quotas.get(label, np.inf) for label in labels] + [np.inf], dtype=float)
+        else:
+            self.department_codes = None
+            self.caps = None
+        self._solved = {}
+        self._lock = threading.Lock()
+
+    def lp_bound(self, budget):
+        """
+        Value of the fractional (LP) relaxation without quotas: the densest
+        projects in full, then a fraction of the next one.
+        """
+        full = int(np.searchsorted(self.prefix_costs, budget, side="right"))
+        value = self.prefix_values[full - 1] if full else 0.0
+        if full < len(self.order):
+            spent = self.prefix_costs[full - 1] if full else 0.0
+            nxt = self.order[full]
+            value += self.values[nxt] * (budget - spent) / max(self.costs[nxt], 1e-12)
+        return float(value)
+
+    def _dept(self, item):
+        # Projects without a department share the uncapped last slot
+        code = self.department_codes[item]
+        return code if code >= 0 else len(self.caps) - 1
+
+    def _greedy(self, budget):
+        chosen = []
+        remaining = budget
+        spent_by_dept = np.zeros(len(self.caps)) if self.caps is not None else None
+        for item in self.order:
+            cost = self.costs[item]
+            if cost > remaining:
+                continue
+            if spent_by_dept is not None:
+                dept = self._dept(item)
+                if spent_by_dept[dept] + cost > self.caps[dept]:
+                    continue
+                spent_by_dept[dept] += cost
+            chosen.append(item)
+            remaining -= cost
+        # Classic safeguard: the single most valuable project that fits may beat the greedy fill
+        fits = [i for i in self.order if self.costs[i] <= budget and
+                (self.caps is None or self.costs[i] <= self.caps[self._dept(i)])]
+        if fits:
+            best_single = max(fits, key=lambda i: self.values[i])
+            if self.values[best_single] > self.values[chosen].sum():
+                chosen = [best_single]
+        return chosen
+
+    def _branch_and_bound(self, budget, incumbent):
+        """
+        Depth-first search over include/exclude decisions in density order,
+        pruning any branch whose LP bound cannot beat the best selection so
+        far. Returns (items, proven_optimal).
+        """
+        order = self.order
+        costs, values = self.costs[order], self.values[order]
+        n = len(order)
+        best_value = self.values[incumbent].sum() if incumbent else 0.0
+        best = [int(np.flatnonzero(order == item)[0]) for item in incumbent]
+        n_caps = len(self.caps) if self.caps is not None else 0
+        depts = [self._dept(item) for item in order] if n_caps else []
+
+        def bound(i, remaining, value):
+            for j in range(i, n):
+                if costs[j] <= remaining:
+                    remaining -= costs[j]
+                    value += values[j]
+                else:
+                    return value + values[j] * remaining / max(costs[j], 1e-12)
+            return value
+
+        stack = [(0, budget, 0.0, (), np.zeros(n_caps))]
+        nodes = 0
+        while stack:
+            i, remaining, value, taken, spent = stack.pop()
+            nodes += 1
+            if nodes > NODE_LIMIT:
+                return [order[j] for j in best], False
+            if value > best_value:
+                best_value, best = value, list(taken)
+            if i == n or bound(i, remaining, value) <= best_value:
+                continue
+            # Exclude first so that the include branch, pushed last, is explored first
+            stack.append((i + 1, remaining, value, taken, spent))
+            if costs[i] <= remaining and (not n_caps or spent[depts[i]] + costs[i] <= self.caps[depts[i]]):
+                spent_after = spent.copy()
+                if n_caps:
+                    spent_after[depts[i]] += costs[i]
+                stack.append((i + 1, remaining - costs[i], value + values[i], taken + (i,), spent_after))
+        return [order[j] for j in best], True
+
+    def solve(self, budget):
+        """
+        Returns the Selection for a budget, reusing any earlier answer for it.
+        """
+        budget = float(budget)
+        with self._lock:
+            cached = self._solved.get(budget)
+        if cached is not None:
+            return cached
+
+        chosen = self._greedy(budget)
+        bound = self.lp_bound(budget)
+        method = "Greedy (LP-bounded)"
+        if len(self.order) <= EXACT_LIMIT:
+            chosen, optimal = self._branch_and_bound(budget, chosen)
+            method = "Exact (branch and bound)" if optimal else "Branch and bound (node limit reached)"
+            if optimal:
+                bound = float(self.values[chosen].sum())
+
+        mask = np.zeros(len(self.costs), dtype=bool)
+        mask[chosen] = True
+        selection = Selection(
+            mask=mask,
+            value=float(self.values[mask].sum()),
+            cost=float(self.costs[mask].sum()),
+            bound=max(bound, float(self.values[mask].sum())),
+            method=method,
+        )
+        with self._lock:
+            self._solved[budget] = selection
+        return selection
+
+# Optimizers per projects table and settings, so a budget change skips the setup
+_OPTIMIZERS = {}
+_MAX_OPTIMIZERS = 32
+_optimizers_lock = threading.Lock()
+
+def get_optimizer(projects_df, objective="carbon", roi_weight=0.5, quotas=None):
+    """
+    Returns the PortfolioOptimizer for a projects frame and objective,
+    building it only the first time those inputs are seen.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(projects_df, index=False).to_numpy().tobytes())
+    digest.update(repr((objective, roi_weight, sorted((quotas or {}).items()))).encode())
+    key = digest.hexdigest()
+    with _optimizers_lock:
+        optimizer = _OPTIMIZERS.get(key)
+        if optimizer is None:
+            optimizer = PortfolioOptimizer(
+                projects_df['Estimated_Cost_USD'].to_numpy(dtype=float, na_value=np.nan),
+                project_values(projects_df, objective, roi_weight),
+                projects_df['Department'].to_numpy(),
+                quotas,
+            )
+            if len(_OPTIMIZERS) >= _MAX_OPTIMIZERS:
+                # Drop the oldest entry; dicts keep insertion order
+                _OPTIMIZERS.pop(next(iter(_OPTIMIZERS)))
+            _OPTIMIZERS[key] = optimizer
+        return optimizer
@@ -2,8 +2,14 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from utils.charts import roi_reduction_chart, priority_scores_chart, macc_chart, project_map_chart
+from utils.exports import png_export
+from utils.figures import cached_figure, source_versions
+from utils.geo_clusters import MAP_MARKER_LIMIT, get_geo_index
 from utils.helpers import load_csv, add_header, add_footer
+from utils.macc import get_macc
+from utils.portfolio import get_optimizer
+from utils.watcher import watch_datasets
 
 def display_project_prioritization():
     add_header("Project Prioritization")
@@ -11,7 +17,9 @@ def display_project_prioritization():
     st.header("Environmental Project Prioritization")
     
     # Load projects data
+    sources = source_versions("data/projects.csv")
     projects_df = load_csv("data/projects.csv")
+    watch_datasets("data/projects.csv")
     
     if not projects_df.empty:
         # Display Projects Table
@@ -30,77 +38,93 @@ def display_project_prioritization():
         
         # Scatter Plot: ROI vs. Carbon Reduction
         st.subheader("ROI vs. Carbon Reduction")
-        fig = px.scatter(
-            projects_df,
-            x='Estimated_Carbon_Reduction_tons',
-            y='ROI_Percentage',
-            size='Estimated_Carbon_Reduction_tons',
-            color='Department',
-            hover_name='Project',
-            title='ROI vs. Carbon Reduction',
-            labels={
-                'Estimated_Carbon_Reduction_tons': 'Estimated Carbon Reduction (tons)',
-                'ROI_Percentage': 'Return on Investment (%)'
-            },
-            size_max=60
-        )
+        fig = cached_figure(roi_reduction_chart, projects_df, sources=sources)
         st.plotly_chart(fig, use_container_width=True)
         
         # Bar Chart: Priority Score by Project
         st.subheader("Priority Scores")
-        fig_priority = px.bar(
-            projects_df,
-            x='Project',
-            y='Priority_Score',
-            color='Priority_Score',
-            title='Project Priority Scores',
-            labels={'Priority_Score': 'Priority Score'},
-            color_continuous_scale='Blues'
-        )
+        fig_priority = cached_figure(priority_scores_chart, projects_df, sources=sources)
         st.plotly_chart(fig_priority, use_container_width=True)
         
+        # Portfolio Optimizer: best subset of projects under a budget
+        st.subheader("Budget-Constrained Portfolio")
+        total_cost = float(projects_df['Estimated_Cost_USD'].sum())
+        budget = st.slider(
+            "Budget (USD)", 0.0, max(total_cost, 1.0), total_cost / 2,
+            step=max(round(total_cost / 200, -3), 1000.0)
+        )
+        objective = st.radio(
+            "Maximize", ["carbon", "weighted"], horizontal=True,
+            format_func={"carbon": "Carbon reduction", "weighted": "Weighted ROI / priority"}.get
+        )
+        roi_weight = st.slider("ROI weight (rest goes to Priority Score)", 0.0, 1.0, 0.5, 0.05) if objective == "weighted" else 0.5
+        with st.expander("Department spend caps"):
+            quotas = {
+                department: st.number_input(
+                    f"{department} (USD, 0 = no cap)", min_value=0.0, value=0.0,
+                    step=10000.0, key=f"department_quota_{department}"
+                ) or None
+                for department in sorted(projects_df['Department'].dropna().astype(str).unique())
+            }
+        selection = get_optimizer(projects_df, objective, roi_weight, quotas).solve(budget)
+        selected = projects_df[selection.mask]
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Selected Projects", f"{len(selected)} / {len(projects_df)}")
+        col2.metric("Cost", f"${selection.cost:,.0f}")
+        col3.metric("Carbon Reduction", f"{selected['Estimated_Carbon_Reduction_tons'].sum():,.0f} tons")
+        gap = (selection.bound - selection.value) / selection.bound if selection.bound else 0.0
+        st.caption(f"Solver: {selection.method}; within {gap:.2%} of the best possible value.")
+        st.dataframe(selected)
+        
+        # Marginal Abatement Cost Curve
+        st.subheader("Marginal Abatement Cost Curve")
+        col1, col2 = st.columns(2)
+        discount_rate = col1.slider("Discount rate", 0.0, 0.2, 0.08, 0.01, format="%.2f")
+        lifetime = col2.slider("Project lifetime (years)", 1, 40, 10)
+        macc_df = get_macc(projects_df, discount_rate, lifetime).frame()
+        fig_macc = cached_figure(macc_chart, macc_df)
+        st.plotly_chart(fig_macc, use_container_width=True)
+        
         # Map Visualization: Project Locations
         st.subheader("Project Locations Map")
-        fig_map = px.scatter_mapbox(
-            projects_df,
-            lat="Latitude",
-            lon="Longitude",
-            hover_name="Project",
-            hover_data=["Description", "Estimated_Carbon_Reduction_tons", "Department"],
-            color="Department",
-            size="Estimated_Carbon_Reduction_tons",
-            size_max=15,
-            zoom=10,
-            height=600,
-            title="Geographical Distribution of Projects"
-        )
-        fig_map.update_layout(mapbox_style="open-street-map")
-        fig_map.update_layout(margin={"r":0,"t":50,"l":0,"b":0})
+        geo_index = get_geo_index(projects_df)
+        if len(geo_index) > MAP_MARKER_LIMIT:
+            # The map cannot report its zoom back, so the view is chosen here
+            col1, col2 = st.columns(2)
+            zoom = col1.slider("Map zoom", 0, 18, geo_index.fit_zoom())
+            largest = geo_index.clusters(zoom).nlargest(10, "Estimated_Carbon_Reduction_tons")
+            focus = col2.selectbox(
+                "Center on", [None] + list(largest.index),
+                format_func=lambda i: "All projects" if i is None else
+                    f"{largest.at[i, 'Latitude']:.3f}, {largest.at[i, 'Longitude']:.3f} ({largest.at[i, 'Projects']:,} projects)"
+            )
+            center = None if focus is None else {"lat": float(largest.at[focus, "Latitude"]), "lon": float(largest.at[focus, "Longitude"])}
+            fig_map = cached_figure(project_map_chart, projects_df, sources=sources, zoom=zoom, center=center)
+        else:
+            fig_map = cached_figure(project_map_chart, projects_df, sources=sources)
         st.plotly_chart(fig_map, use_container_width=True)
         
         # Download Charts
-        img_bytes_scatter = fig.to_image(format="png")
         st.download_button(
             label="Download ROI vs. Carbon Reduction Chart",
-            data=img_bytes_scatter,
+            data=png_export(fig),
             file_name='roi_carbon_reduction_chart.png',
             mime='image/png',
             key='download_roi_carbon_chart_unique'
         )
         
-        img_bytes_priority = fig_priority.to_image(format="png")
         st.download_button(
             label="Download Priority Scores Chart",
-            data=img_bytes_priority,
+            data=png_export(fig_priority),
             file_name='priority_scores_chart.png',
             mime='image/png',
             key='download_priority_scores_chart_unique'
         )
         
-        img_bytes_map = fig_map.to_image(format="png")
         st.download_button(
             label="Download Project Locations Map",
-            data=img_bytes_map,
+            data=png_export(fig_map),
             file_name='project_locations_map.png',
             mime='image/png',
             key='download_project_locations_map_unique'
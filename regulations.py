@@ -2,8 +2,12 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from utils.helpers import load_csv, add_header, add_footer, SUCCESS_COLOR, WARNING_COLOR, ERROR_COLOR
+from utils.charts import regulations_status_chart
+from utils.exports import png_export
+from utils.figures import cached_figure, source_versions
+from utils.helpers import load_csv, add_header, add_footer
+from utils.store import count_by
+from utils.watcher import watch_datasets
 
 def display_regulations():
     """
@@ -16,7 +20,9 @@ def display_regulations():
     st.header("Regulatory Compliance Overview")
     
     # Load regulations data
+    sources = source_versions("data/regulations.csv")
     regulations_df = load_csv("data/regulations.csv")
+    watch_datasets("data/regulations.csv")
     
     if not regulations_df.empty:
         # Display Regulations Table
@@ -35,24 +41,14 @@ def display_regulations():
         
         # Visualization: Regulations Status Pie Chart
         st.subheader("Regulations Status Distribution")
-        fig = px.pie(
-            regulations_df,
-            names='Status',
-            title='Regulations Status Distribution',
-            color='Status',
-            color_discrete_map={
-                'Completed': SUCCESS_COLOR,
-                'In Progress': WARNING_COLOR,
-                'Planned': ERROR_COLOR
-            }
-        )
+        status_counts = count_by("data/regulations.csv", 'Status')
+        fig = cached_figure(regulations_status_chart, status_counts, sources=sources)
         st.plotly_chart(fig, use_container_width=True)
         
         # Download Chart as Image
-        img_bytes = fig.to_image(format="png")
         st.download_button(
             label="Download Regulations Chart",
-            data=img_bytes,
+            data=png_export(fig),
             file_name='regulations_chart.png',
             mime='image/png',
             key='download_regulations_chart_unique'
@@ -0,0 +1,183 @@
+# utils/report.py
+
+from datetime import datetime
+import html
+import io
+import re
+import zipfile
+
+from utils.calculations import simulate_losses
+from utils.charts import (
+    compliance_status_chart, financial_impact_chart, investment_reduction_chart, kpi_progress_chart,
+    loss_distribution_chart, macc_chart, priority_scores_chart, project_map_chart, public_data_chart,
+    regulations_status_chart, roi_reduction_chart, tasks_by_department_chart,
+)
+from utils.exports import figure_pngs
+from utils.figures import cached_figure, source_versions
+from utils.helpers import calculate_financial_impact, load_csv
+from utils.macc import get_macc
+from utils.portfolio import get_optimizer
+from utils.store import count_by
+
+# Page settings the report uses where the page itself has a control
+REPORT_DISCOUNT_RATE = 0.08
+REPORT_LIFETIME = 10
+
+def _dashboard():
+    tables, figures = {}, {}
+    sources = source_versions("data/esg_tasks.csv")
+    esg_df = load_csv("data/esg_tasks.csv")
+    if not esg_df.empty:
+        tables["ESG Tasks"] = esg_df
+        grouped = count_by("data/esg_tasks.csv", 'Responsible', name='Task Count')
+        figures["Tasks by Department"] = cached_figure(tasks_by_department_chart, grouped, sources=sources)
+    sources = source_versions("data/public_data.csv")
+    public_data = load_csv("data/public_data.csv")
+    if not public_data.empty:
+        tables["Public Data"] = public_data
+        figures["Public Data"] = cached_figure(public_data_chart, public_data, sources=sources)
+    return tables, figures
+
+def _climate_risk():
+    tables, figures = {}, {}
+    sources = source_versions("data/risk_data.csv")
+    risk_df = load_csv("data/risk_data.csv")
+    if not risk_df.empty:
+        risk_df = calculate_financial_impact(risk_df)
+        tables["Risk Data"] = risk_df
+        figures["Financial Impact by Risk Subcategory"] = cached_figure(financial_impact_chart, risk_df, sources=sources)
+        simulation = simulate_losses(risk_df)
+        tables["Simulated Loss Distribution"] = simulation.summary.reset_index()
+        counts, edges = simulation.histogram
+        figures["Simulated Loss Distribution"] = cached_figure(loss_distribution_chart, counts, edges)
+    return tables, figures
+
+def _regulations():
+    tables, figures = {}, {}
+    sources = source_versions("data/regulations.csv")
+    regulations_df = load_csv("data/regulations.csv")
+    if not regulations_df.empty:
+        tables["Regulations"] = regulations_df
+        status_counts = count_by("data/regulations.csv", 'Status')
+        figures["Regulation Status"] = cached_figure(regulations_status_chart, status_counts, sources=sources)
+    return tables, figures
+
+def _projects():
+    tables, figures = {}, {}
+    sources = source_versions("data/projects.csv")
+    projects_df = load_csv("data/projects.csv")
+    if not projects_df.empty:
+        tables["Projects Overview"] = projects_df
+        figures["ROI vs. Carbon Reduction"] = cached_figure(roi_reduction_chart, projects_df, sources=sources)
+        figures["Priority Scores"] = cached_figure(priority_scores_chart, projects_df, sources=sources)
+        # The page's default portfolio: half the total cost, maximizing carbon reduction
+        budget = float(projects_df['Estimated_Cost_USD'].sum()) / 2
+        selection = get_optimizer(projects_df, "carbon", 0.5, {}).solve(budget)
+        tables["Budget-Constrained Portfolio"] = projects_df[selection.mask]
+        macc_df = get_macc(projects_df, REPORT_DISCOUNT_RATE, REPORT_LIFETIME).frame()
+        tables["Marginal Abatement Cost Curve"] = macc_df
+        figures["Marginal Abatement Cost Curve"] = cached_figure(macc_chart, macc_df)
+        figures["Project Locations Map"] = cached_figure(project_map_chart, projects_df, sources=sources)
+    return tables, figures
+
+def _kpis():
+    tables, figures = {}, {}
+    sources = source_versions("data/kpi_data.csv")
+    kpi_df = load_csv("data/kpi_data.csv")
+    if not kpi_df.empty:
+        tables["KPIs"] = kpi_df
+        kpi_melted = kpi_df.melt(
+            id_vars=['KPI'],
+            value_vars=['Value', 'Target'],
+            var_name='Type',
+            value_name='Amount'
+        ).dropna(subset=['Amount'])
+        figures["KPI Progress Overview"] = cached_figure(kpi_progress_chart, kpi_melted, sources=sources)
+    return tables, figures
+
+def _scenarios():
+    tables, figures = {}, {}
+    sources = source_versions("data/scenario_data.csv")
+    scenario_df = load_csv("data/scenario_data.csv")
+    if not scenario_df.empty:
+        tables["Scenarios"] = scenario_df
+        figures["Investment vs. Carbon Reduction"] = cached_figure(investment_reduction_chart, scenario_df, sources=sources)
+    return tables, figures
+
+def _compliance():
+    tables, figures = {}, {}
+    sources = source_versions("data/compliance_tracker.csv")
+    compliance_df = load_csv("data/compliance_tracker.csv")
+    if not compliance_df.empty:
+        tables["Compliance Tracker"] = compliance_df
+        status_counts = count_by("data/compliance_tracker.csv", 'Compliance_Status')
+        figures["Compliance Status"] = cached_figure(compliance_status_chart, status_counts, sources=sources)
+    return tables, figures
+
+REPORT_SECTIONS = [
+    ("Dashboard", _dashboard),
+    ("Climate Risk Analysis", _climate_risk),
+    ("Regulations", _regulations),
+    ("Project Prioritization", _projects),
+    ("KPI Dashboard", _kpis),
+    ("Scenario Simulation", _scenarios),
+    ("Compliance Tracker", _compliance),
+]
+
+def _slug(title):
+    return re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_")
+
+def build_report():
+    """
+    Builds the full report as ZIP bytes: one folder per page with its tables
+    as CSV and its charts as PNG, plus report.html, which puts each page on
+    its own printed sheet. Charts come from the figure cache, and every PNG
+    not already rendered is rendered at once across the export pool.
+    """
+    sections = []
+    for number, (title, section) in enumerate(REPORT_SECTIONS, start=1):
+        try:
+            tables, figures = section()
+        except Exception as e:
+            print(f"Error building the {title} report section: {e}")
+            tables, figures = {}, {}
+        sections.append((f"{number:02d}_{_slug(title)}", title, tables, figures))
+
+    charts = [fig for _, _, _, figures in sections for fig in figures.values()]
+    try:
+        pngs = iter(figure_pngs(charts))
+    except Exception as e:
+        # Still ship the tables when the PNG renderer is unavailable
+        print(f"Error rendering report charts: {e}")
+        pngs = iter([None] * len(charts))
+
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M")
+    pages = []
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for folder, title, tables, figures in sections:
+            body = [f"<h1>{html.escape(title)}</h1>"]
+            for name, png in zip(figures, pngs):
+                body.append(f"<h2>{html.escape(name)}</h2>")
+                if png is None:
+                    body.append("<p>Chart unavailable.</p>")
+                    continue
+                path = f"{folder}/{_slug(name)}.png"
+                # PNGs are already compressed
+                archive.writestr(path, png, compress_type=zipfile.ZIP_STORED)
+                body.append(f"<img src=\"{path}\">")
+            for name, df in tables.items():
+                archive.writestr(f"{folder}/{_slug(name)}.csv", df.to_csv(index=False))
+                body.append(f"<h2>{html.escape(name)}</h2>{df.to_html(index=False)}")
+            if not tables and not figures:
+                body.append("<p>No data available.</p>")
+            pages.append(f"<section>{''.join(body)}</section>")
+        archive.writestr("report.html", (
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+            "<title>Bank Leumi Environmental Report</title><style>"
+            "body{font-family:sans-serif}section{page-break-after:always}"
+            "img{max-width:100%}table{border-collapse:collapse;font-size:11px}"
+            "td,th{border:1px solid #ccc;padding:2px 6px}"
+            f"</style></head><body><p>Generated {generated}</p>{''.join(pages)}</body></html>"
+        ))
+    return buffer.getvalue()
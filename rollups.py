@@ -0,0 +1,72 @@
+# utils/rollups.py
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.schemas import get_schema
+
+# Counts per absolute dataset path, then per column, as [column, "Count"] frames
+_ROLLUPS = {}
+_rollups_lock = threading.Lock()
+
+def _count(values):
+    counts = values.value_counts(dropna=True)
+    # Categorical columns also list categories no row uses
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(object)
+    return counts
+
+def refresh_rollups(file_path, df, previous=None):
+    """
+    Updates the rollup counts of a dataset for a freshly loaded version.
+    load_csv calls this once per version, so reruns read the stored counts
+    instead of grouping the table again.
+
+    previous is the prior version of the frame when the file only grew by
+    appended rows; the rows past its length are then counted and added to
+    the stored counts. Any other change recounts the columns in full.
+    """
+    schema = get_schema(file_path)
+    if schema is None or not schema.rollups:
+        return
+    key = os.path.abspath(file_path)
+    with _rollups_lock:
+        stored = _ROLLUPS.get(key, {})
+    start = len(previous) if previous is not None and len(previous) <= len(df) else None
+    rollups = {}
+    for column in schema.rollups:
+        if column not in df.columns:
+            continue
+        if start is not None and column in stored:
+            base = stored[column].set_index(column)["Count"]
+            counts = base.add(_count(df[column].iloc[start:]), fill_value=0).astype(base.dtype)
+        else:
+            counts = _count(df[column])
+        counts = counts.sort_index()
+        rollups[column] = pd.DataFrame({column: counts.index, "Count": counts.to_numpy()})
+    with _rollups_lock:
+        _ROLLUPS[key] = rollups
+
+def get_rollup(file_path, column, name="Count"):
+    """
+    Returns the pre-aggregated counts for a dataset column as [column, name],
+    or None if that column has no rollup or the dataset was not ingested yet.
+    """
+    with _rollups_lock:
+        rollup = _ROLLUPS.get(os.path.abspath(file_path), {}).get(column)
+    return rollup.rename(columns={"Count": name}) if rollup is not None else None
+
+def completion_buckets(completion):
+    """
+    Counts Completion (%) values as completed (100), in progress (between
+    0 and 100) and not started (0) in one vectorized pass.
+    """
+    values = np.asarray(completion)
+    return {
+        "Completed": int(np.count_nonzero(values >= 100)),
+        "In Progress": int(np.count_nonzero((values > 0) & (values < 100))),
+        "Not Started": int(np.count_nonzero(values <= 0)),
+    }
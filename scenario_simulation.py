@@ -2,8 +2,13 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from utils.charts import investment_reduction_chart, sweep_chart
+from utils.exports import png_export
+from utils.figures import cached_figure, source_versions
 from utils.helpers import load_csv, add_header, add_footer
+from utils.store import select_rows
+from utils.sweeps import SweepDefinition, run_sweep
+from utils.watcher import watch_datasets
 
 def display_scenario_simulation():
     """
@@ -16,7 +21,9 @@ def display_scenario_simulation():
     st.header("Scenario Simulation Tool")
     
     # Load scenario data
+    sources = source_versions("data/scenario_data.csv")
     scenario_df = load_csv("data/scenario_data.csv")
+    watch_datasets("data/scenario_data.csv")
     
     if not scenario_df.empty:
         # Display Scenarios Table
@@ -38,56 +45,79 @@ def display_scenario_simulation():
         selected_scenario = st.selectbox("Choose Scenario", scenario_df['Scenario'])
         
         # Fetch Selected Scenario Details
-        scenario_details = scenario_df[scenario_df['Scenario'] == selected_scenario].iloc[0]
+        scenario_details = select_rows("data/scenario_data.csv", Scenario=selected_scenario).iloc[0]
         
         st.markdown(f"**Description:** {scenario_details['Description']}")
-        st.markdown(f"**Investment:** ${scenario_details['Investment_USD']:,}")
+        # Numeric and date columns are typed at load time (see utils.schemas);
+        # values that failed to parse arrive as NaN/NaT
+        investment = scenario_details['Investment_USD']
+        if pd.notna(investment):
+            st.markdown(f"**Investment:** ${investment:,.0f}")
+        else:
+            st.markdown("**Investment:** Data not available")
         
-        # Ensure 'Estimated_Carbon_Reduction_tons' is numeric
-        try:
-            carbon_reduction = float(scenario_details['Estimated_Carbon_Reduction_tons'])
+        carbon_reduction = scenario_details['Estimated_Carbon_Reduction_tons']
+        if pd.notna(carbon_reduction):
             st.markdown(f"**Estimated Carbon Reduction:** {carbon_reduction:,.0f} tons")
-        except ValueError:
+        else:
             st.markdown("**Estimated Carbon Reduction:** Data not available")
         
-        st.markdown(f"**Timeframe:** {scenario_details['Estimated_Timeframe']}")
+        timeframe = scenario_details['Estimated_Timeframe']
+        st.markdown(f"**Timeframe:** {timeframe:%Y-%m-%d}" if pd.notna(timeframe) else "**Timeframe:** Data not available")
         st.markdown(f"**Status:** {scenario_details['Status']}")
         
-        # Ensure 'Estimated_Carbon_Reduction_tons' and 'Investment_USD' are numeric for plotting
-        scenario_df['Estimated_Carbon_Reduction_tons'] = pd.to_numeric(scenario_df['Estimated_Carbon_Reduction_tons'], errors='coerce')
-        scenario_df['Investment_USD'] = pd.to_numeric(scenario_df['Investment_USD'], errors='coerce')
-        
         # Remove rows with NaN in critical columns
         scenario_df = scenario_df.dropna(subset=['Estimated_Carbon_Reduction_tons', 'Investment_USD'])
         
         # Visualization: Investment vs. Carbon Reduction
         st.subheader("Investment vs. Carbon Reduction")
-        fig = px.scatter(
-            scenario_df,
-            x='Investment_USD',
-            y='Estimated_Carbon_Reduction_tons',
-            size='Estimated_Carbon_Reduction_tons',
-            color='Status',
-            hover_name='Scenario',
-            title='Investment vs. Carbon Reduction Across Scenarios',
-            labels={
-                'Investment_USD': 'Investment (USD)',
-                'Estimated_Carbon_Reduction_tons': 'Estimated Carbon Reduction (tons)'
-            },
-            size_max=60
-        )
+        fig = cached_figure(investment_reduction_chart, scenario_df, sources=sources)
         st.plotly_chart(fig, use_container_width=True)
         
         # Download Chart as Image
-        img_bytes = fig.to_image(format="png")
         st.download_button(
             label="Download Scenario Chart",
-            data=img_bytes,
+            data=png_export(fig),
             file_name='scenario_chart.png',
             mime='image/png',
             key='download_scenario_chart_unique'
         )
         
+        # Sweep Mode: evaluate many parameter combinations at once
+        st.subheader("Scenario Sweep and Pareto Frontier")
+        investments = scenario_df['Investment_USD']
+        default_investment = (float(investments.min()), float(investments.max())) if not investments.empty else (100_000.0, 2_000_000.0)
+        with st.form("scenario_sweep"):
+            investment = st.slider(
+                "Investment range (USD)", 0.0, max(default_investment[1] * 3, 1.0),
+                default_investment, step=10_000.0
+            )
+            efficiency = st.slider("Reduction efficiency (tons per USD 1,000 per year)", 0.0, 200.0, (5.0, 50.0))
+            years = st.slider("Timeframe (years)", 1.0, 30.0, (1.0, 10.0))
+            col1, col2 = st.columns(2)
+            points = col1.select_slider("Scenario points", options=[1_000, 10_000, 100_000, 1_000_000], value=100_000)
+            method = col2.radio("Sampling", ["lhs", "grid"], format_func={"lhs": "Latin hypercube", "grid": "Grid"}.get, horizontal=True)
+            st.form_submit_button("Run Sweep")
+        definition = SweepDefinition(
+            investment=tuple(investment), efficiency=tuple(efficiency), years=tuple(years),
+            points=points, method=method,
+        )
+        sweep = run_sweep(definition)
+        frontier = sweep[sweep['Pareto']].sort_values('Cost_USD')
+        st.write(f"**{len(sweep):,}** scenarios evaluated, **{len(frontier):,}** on the Pareto frontier.")
+        
+        # The sweep definition identifies the chart, so the points are never hashed
+        fig_sweep = cached_figure(sweep_chart, definition)
+        st.plotly_chart(fig_sweep, use_container_width=True)
+        
+        st.download_button(
+            label="Download Pareto Frontier",
+            data=frontier.drop(columns='Pareto').to_csv(index=False).encode('utf-8'),
+            file_name='pareto_frontier.csv',
+            mime='text/csv',
+            key='download_pareto_frontier_unique'
+        )
+        
     else:
         st.warning("No scenario data available.")
     
@@ -0,0 +1,190 @@
+# utils/schemas.py
+
+from dataclasses import dataclass, field
+import os
+
+import pandas as pd
+
+DATE_FORMAT = "%Y-%m-%d"
+
+@dataclass(frozen=True)
+class DatasetSchema:
+    """
+    Declares how a data/*.csv file is typed once at load time, and the rules
+    validate_csv.py checks it against.
+    """
+    columns: tuple
+    numeric: tuple = ()
+    dates: tuple = ()
+    categories: tuple = ()
+    # Inclusive (min, max) bounds per numeric column; None leaves a side open
+    ranges: dict = field(default_factory=dict)
+    # Allowed values per column
+    allowed: dict = field(default_factory=dict)
+    # (earlier, later) date column pairs that must be in order
+    date_order: tuple = ()
+    # Columns indexed in the embedded store (see utils.store)
+    indexes: tuple = ()
+    # Columns counted once per loaded version (see utils.rollups)
+    rollups: tuple = ()
+    # Natural key that ingest.py deduplicates on
+    key: tuple = ()
+    # Read in chunks by its own module and never loaded whole through load_csv
+    # or the dataset watcher
+    streamed: bool = False
+    # utf-8-sig strips the BOM that Excel writes at the start of several files
+    encoding: str = "utf-8-sig"
+    read_options: dict = field(default_factory=dict)
+
+# One entry per CSV listed in validate_csv.csv_files, plus the optional loan
+# book (see utils.financed_emissions), keyed on the file name.
+SCHEMAS = {
+    "esg_tasks.csv": DatasetSchema(
+        columns=("Task", "Description", "Deadline", "Responsible"),
+        dates=("Deadline",),
+        categories=("Task", "Responsible"),
+        indexes=("Responsible", "Deadline"),
+        rollups=("Responsible",),
+    ),
+    "benchmark_data.csv": DatasetSchema(
+        columns=("Bank", "Carbon_Intensity_kgCO2e_millionUSD", "Industry_Average"),
+        numeric=("Carbon_Intensity_kgCO2e_millionUSD", "Industry_Average"),
+        ranges={"Carbon_Intensity_kgCO2e_millionUSD": (0, None), "Industry_Average": (0, None)},
+    ),
+    "public_data.csv": DatasetSchema(
+        columns=("Country", "Carbon_Price_USD_per_ton", "Carbon_Tax_USD_per_ton", "Carbon_Offset_Credits_USD_per_ton"),
+        numeric=("Carbon_Price_USD_per_ton", "Carbon_Tax_USD_per_ton", "Carbon_Offset_Credits_USD_per_ton"),
+        ranges={
+            "Carbon_Price_USD_per_ton": (0, None),
+            "Carbon_Tax_USD_per_ton": (0, None),
+            "Carbon_Offset_Credits_USD_per_ton": (0, None),
+        },
+    ),
+    "risk_data.csv": DatasetSchema(
+        columns=("Risk_Category", "Subcategory", "Probability", "Severity"),
+        numeric=("Probability", "Severity"),
+        categories=("Risk_Category",),
+        ranges={"Probability": (0, 1), "Severity": (0, None)},
+        allowed={"Risk_Category": ("Physical", "Transitional")},
+        indexes=("Risk_Category",),
+        key=("Subcategory",),
+    ),
+    "performance_data.csv": DatasetSchema(
+        columns=("Year", "Revenue", "Expenses", "Profit"),
+        numeric=("Year", "Revenue", "Expenses", "Profit"),
+        ranges={"Year": (1900, 2100), "Revenue": (0, None), "Expenses": (0, None)},
+    ),
+    "regulations.csv": DatasetSchema(
+        columns=("Regulation", "Description", "Category", "Start_Date", "End_Date", "Status"),
+        dates=("Start_Date", "End_Date"),
+        categories=("Category", "Status"),
+        allowed={"Category": ("International", "Local"), "Status": ("Completed", "In Progress", "Planned")},
+        date_order=(("Start_Date", "End_Date"),),
+        indexes=("Regulation", "Status", "Start_Date", "End_Date"),
+        rollups=("Status",),
+    ),
+    "projects.csv": DatasetSchema(
+        columns=(
+            "Project", "Description", "Department", "Estimated_Cost_USD", "Estimated_Carbon_Reduction_tons",
+            "ROI_Percentage", "Priority_Score", "Latitude", "Longitude",
+        ),
+        numeric=(
+            "Estimated_Cost_USD", "Estimated_Carbon_Reduction_tons", "ROI_Percentage",
+            "Priority_Score", "Latitude", "Longitude",
+        ),
+        categories=("Department",),
+        ranges={
+            "Estimated_Cost_USD": (0, None),
+            "Estimated_Carbon_Reduction_tons": (0, None),
+            "Priority_Score": (0, 100),
+            "Latitude": (-90, 90),
+            "Longitude": (-180, 180),
+        },
+        indexes=("Department",),
+        key=("Project",),
+    ),
+    "scenario_data.csv": DatasetSchema(
+        columns=(
+            "Scenario", "Description", "Investment_USD", "Estimated_Carbon_Reduction_tons",
+            "Estimated_Timeframe", "Status",
+        ),
+        numeric=("Investment_USD", "Estimated_Carbon_Reduction_tons"),
+        dates=("Estimated_Timeframe",),
+        categories=("Status",),
+        ranges={"Investment_USD": (0, None), "Estimated_Carbon_Reduction_tons": (0, None)},
+        allowed={"Status": ("Completed", "In Progress", "Planned")},
+        indexes=("Scenario", "Status", "Estimated_Timeframe"),
+        key=("Scenario",),
+    ),
+    "kpi_data.csv": DatasetSchema(
+        columns=("KPI", "Value", "Target", "Status"),
+        numeric=("Value", "Target"),
+        categories=("Status",),
+        allowed={"Status": ("On Track", "Off Track", "Under Target", "Over Budget")},
+        indexes=("KPI",),
+    ),
+    "compliance_tracker.csv": DatasetSchema(
+        columns=("Regulation", "Compliance_Status", "Last_Reviewed_Date", "Next_Review_Date", "Responsible_Department"),
+        dates=("Last_Reviewed_Date", "Next_Review_Date"),
+        categories=("Compliance_Status", "Responsible_Department"),
+        allowed={"Compliance_Status": ("Compliant", "In Progress", "Planned")},
+        date_order=(("Last_Reviewed_Date", "Next_Review_Date"),),
+        indexes=("Regulation", "Compliance_Status", "Responsible_Department", "Next_Review_Date"),
+        rollups=("Compliance_Status",),
+    ),
+    "loan_book.csv": DatasetSchema(
+        columns=(
+            "Counterparty", "Asset_Class", "Sector", "Owner", "Outstanding_USD", "EVIC_USD",
+            "Counterparty_Emissions_tons",
+        ),
+        numeric=("Outstanding_USD", "EVIC_USD", "Counterparty_Emissions_tons"),
+        categories=("Asset_Class", "Sector", "Owner"),
+        ranges={
+            "Outstanding_USD": (0, None),
+            "EVIC_USD": (0, None),
+            "Counterparty_Emissions_tons": (0, None),
+        },
+        allowed={"Asset_Class": ("Corporate Loans", "Investments")},
+        key=("Counterparty", "Asset_Class"),
+        # Can run to millions of rows; loan_book_version() tracks its changes
+        streamed=True,
+    ),
+}
+
+def get_schema(file_path):
+    """
+    Returns the schema registered for a CSV file, or None if it has none.
+    """
+    return SCHEMAS.get(os.path.basename(file_path))
+
+def read_options(schema):
+    """
+    Returns the keyword arguments to pass to pd.read_csv for a schema.
+    """
+    options = {"encoding": "utf-8-sig"}
+    if schema is not None:
+        # Rows with a stray extra field must not turn the first column into the index.
+        options = {"encoding": schema.encoding, "index_col": False, **schema.read_options}
+    return options
+
+def apply_schema(df, schema):
+    """
+    Coerces the columns of a freshly parsed DataFrame to their declared types.
+    Values that do not parse become NaN/NaT instead of failing the load.
+    """
+    if schema is None:
+        return df
+    for column in schema.numeric:
+        if column in df.columns:
+            values = pd.to_numeric(df[column], errors="coerce")
+            # Whole-number columns stored as float (e.g. in ingest snapshots) go back to int64
+            if values.dtype.kind == "f" and values.notna().all() and (values % 1 == 0).all():
+                values = values.astype("int64")
+            df[column] = values
+    for column in schema.dates:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce", format=DATE_FORMAT)
+    for column in schema.categories:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
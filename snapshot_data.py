@@ -0,0 +1,23 @@
+# snapshot_data.py
+
+import os
+
+from utils.helpers import load_csv
+from utils.schemas import SCHEMAS
+from utils.snapshots import is_snapshot_fresh, write_snapshot
+
+# Converts every data/*.csv into a memory-mappable columnar snapshot.
+# The CSV stays the editable source of truth; load_csv ignores a snapshot
+# as soon as the CSV is edited after it, so re-run this after each refresh.
+for name in SCHEMAS:
+    csv = os.path.join("data", name)
+    if not os.path.exists(csv):
+        print(f"File not found: {csv}")
+    elif is_snapshot_fresh(csv):
+        print(f"Snapshot up to date: {csv}")
+    else:
+        df = load_csv(csv)
+        if df.empty:
+            print(f"Skipped {csv}: no data loaded.")
+        else:
+            print(f"Wrote {write_snapshot(csv, df)} ({len(df)} rows)")
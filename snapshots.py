@@ -0,0 +1,57 @@
+# utils/snapshots.py
+
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+SNAPSHOT_SUFFIX = ".feather"
+
+def snapshot_path(csv_path):
+    """
+    Returns the path of the columnar snapshot that sits next to a CSV file.
+    """
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+def is_snapshot_fresh(csv_path):
+    """
+    Returns True if the CSV has a snapshot written after its last edit.
+    """
+    path = snapshot_path(csv_path)
+    try:
+        return os.stat(path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def arrow_schema(schema):
+    """
+    Returns a fixed Arrow schema for a dataset, so that chunks written one at
+    a time (see ingest.py) all share the same column types.
+    """
+    def arrow_type(column):
+        if column in schema.numeric:
+            return pa.float64()
+        if column in schema.dates:
+            return pa.timestamp("ns")
+        return pa.string()
+
+    return pa.schema([(column, arrow_type(column)) for column in schema.columns])
+
+def write_snapshot(csv_path, df):
+    """
+    Writes a typed DataFrame as an uncompressed Arrow IPC (Feather v2) file.
+    Uncompressed buffers are what allow read_snapshot to memory-map them.
+    """
+    path = snapshot_path(csv_path)
+    tmp_path = path + ".tmp"
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    # Replace atomically so readers never see a half-written snapshot.
+    os.replace(tmp_path, path)
+    return path
+
+def read_snapshot(csv_path):
+    """
+    Memory-maps the snapshot of a CSV file and returns it as a DataFrame.
+    """
+    table = feather.read_table(snapshot_path(csv_path), memory_map=True)
+    return table.to_pandas(split_blocks=True)
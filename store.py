@@ -0,0 +1,149 @@
+# utils/store.py
+
+from contextlib import contextmanager
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from utils.helpers import load_csv
+from utils.rollups import get_rollup
+from utils.schemas import DATE_FORMAT, apply_schema, get_schema, read_options
+
+# Optional embedded SQLite store. Set ESG_STORE_PATH (e.g. data/esg_store.sqlite)
+# to push filters and aggregations down into indexed tables; without it every
+# query falls back to filtering the cached DataFrame in pandas.
+STORE_PATH = os.environ.get("ESG_STORE_PATH")
+
+_sync_lock = threading.Lock()
+
+def store_enabled():
+    """
+    Returns True if queries are served from the embedded store.
+    """
+    return bool(STORE_PATH)
+
+def _table_name(file_path):
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+@contextmanager
+def _connect():
+    conn = sqlite3.connect(STORE_PATH, timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def _to_sql_frame(df, schema):
+    """
+    Converts a typed chunk to plain columns SQLite can store and index.
+    Dates are kept as ISO strings so they sort and compare correctly.
+    """
+    df = df.copy()
+    for column in schema.dates if schema else ():
+        if column in df.columns:
+            df[column] = df[column].dt.strftime(DATE_FORMAT)
+    for column in schema.categories if schema else ():
+        if column in df.columns:
+            df[column] = df[column].astype(object)
+    return df
+
+def sync_table(file_path, chunksize=100_000):
+    """
+    Loads a CSV into its store table, streaming it in chunks, unless the table
+    is already up to date with the file's mtime and size. Returns the table name.
+    """
+    table = _table_name(file_path)
+    stat = os.stat(file_path)
+    with _sync_lock, _connect() as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS _datasets (name TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER)"
+        )
+        row = conn.execute("SELECT mtime_ns, size FROM _datasets WHERE name = ?", (table,)).fetchone()
+        if row == (stat.st_mtime_ns, stat.st_size):
+            return table
+
+        # Stream into a staging table, then swap it in with one transaction,
+        # so readers see either the old table or the new one, never a partial one
+        schema = get_schema(file_path)
+        staging = f"_staging_{table}"
+        conn.execute(f"DROP TABLE IF EXISTS {_quote(staging)}")
+        for chunk in pd.read_csv(file_path, chunksize=chunksize, **read_options(schema)):
+            chunk = _to_sql_frame(apply_schema(chunk, schema), schema)
+            chunk.to_sql(staging, conn, if_exists="append", index=False)
+        conn.commit()
+        conn.execute("BEGIN")
+        conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+        conn.execute(f"ALTER TABLE {_quote(staging)} RENAME TO {_quote(table)}")
+        for column in schema.indexes if schema else ():
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{column}')} "
+                f"ON {_quote(table)} ({_quote(column)})"
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO _datasets (name, mtime_ns, size) VALUES (?, ?, ?)",
+            (table, stat.st_mtime_ns, stat.st_size),
+        )
+    print(f"Synced data/{os.path.basename(file_path)} into the store.")
+    return table
+
+def _sql_value(value):
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(DATE_FORMAT)
+    return value
+
+def select_rows(file_path, **equals):
+    """
+    Returns the rows of a dataset whose columns equal the given values,
+    e.g. select_rows("data/scenario_data.csv", Scenario="Moderate Growth").
+    """
+    if not store_enabled():
+        df = load_csv(file_path)
+        if df.empty:
+            return df
+        mask = pd.Series(True, index=df.index)
+        for column, value in equals.items():
+            mask &= df[column] == value
+        return df[mask].reset_index(drop=True)
+
+    table = sync_table(file_path)
+    where = " AND ".join(f"{_quote(column)} = ?" for column in equals) or "1"
+    with _connect() as conn:
+        df = pd.read_sql_query(
+            f"SELECT * FROM {_quote(table)} WHERE {where}", conn,
+            params=[_sql_value(value) for value in equals.values()],
+        )
+    return apply_schema(df, get_schema(file_path))
+
+def count_by(file_path, column, name="Count"):
+    """
+    Returns the number of rows per value of a column, as [column, name],
+    sorted by value. Rows where the column is missing are not counted, the
+    same as in the rollups. Columns with a rollup (see utils.rollups) are
+    served pre-aggregated.
+    """
+    schema = get_schema(file_path)
+    if schema is not None and column in schema.rollups:
+        # load_csv ingests the file, and so updates its rollups, if it changed
+        load_csv(file_path)
+        rollup = get_rollup(file_path, column, name)
+        return rollup if rollup is not None else pd.DataFrame(columns=[column, name])
+
+    if not store_enabled():
+        df = load_csv(file_path)
+        if df.empty:
+            return pd.DataFrame(columns=[column, name])
+        return df.groupby(column, observed=True, dropna=True).size().reset_index(name=name)
+
+    table = sync_table(file_path)
+    with _connect() as conn:
+        return pd.read_sql_query(
+            f"SELECT {_quote(column)}, COUNT(*) AS {_quote(name)} FROM {_quote(table)} "
+            f"WHERE {_quote(column)} IS NOT NULL GROUP BY {_quote(column)} ORDER BY {_quote(column)}",
+            conn,
+        )
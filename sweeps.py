@@ -0,0 +1,103 @@
+# utils/sweeps.py
+
+from dataclasses import dataclass
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.helpers import BoundedLRU
+
+# Yearly upkeep of a scenario, as a share of its upfront investment
+MAINTENANCE_RATE = 0.05
+
+# Upper bound on the finished sweeps kept in memory, shared by every session
+SWEEP_CACHE_BYTES = int(os.environ.get("ESG_SWEEP_CACHE_MB", "256")) * 1024 * 1024
+
+@dataclass(frozen=True)
+class SweepDefinition:
+    """
+    A sweep over the scenario parameters. Each range is an inclusive
+    (low, high) pair; method is "grid" or "lhs" (Latin hypercube).
+    """
+    investment: tuple = (100_000, 2_000_000)
+    # Tons of CO2 avoided per USD 1,000 invested, per year
+    efficiency: tuple = (5.0, 50.0)
+    # Years the measures run for
+    years: tuple = (1.0, 10.0)
+    points: int = 100_000
+    method: str = "lhs"
+    seed: int = 42
+
+# Finished sweeps, keyed on their (hashable) definition
+_SWEEPS = BoundedLRU(SWEEP_CACHE_BYTES, sizeof=lambda sweep: int(sweep.memory_usage(index=True).sum()))
+
+def sample_points(definition):
+    """
+    Returns an (n, 3) array of investment, efficiency and years values.
+    A grid uses the same number of steps on every axis, so it may hold
+    slightly fewer points than requested.
+    """
+    bounds = np.array([definition.investment, definition.efficiency, definition.years], dtype=float)
+    low, span = bounds[:, 0], bounds[:, 1] - bounds[:, 0]
+    if definition.method == "grid":
+        steps = max(int(round(definition.points ** (1 / 3))), 1)
+        axis = np.linspace(0.0, 1.0, steps) if steps > 1 else np.zeros(1)
+        unit = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+    elif definition.method == "lhs":
+        # One point per stratum on every axis, strata shuffled independently
+        rng = np.random.default_rng(definition.seed)
+        n = definition.points
+        strata = np.column_stack([rng.permutation(n) for _ in range(3)])
+        unit = (strata + rng.random((n, 3))) / n
+    else:
+        raise ValueError(f"Unknown sweep method {definition.method!r}; use 'grid' or 'lhs'")
+    return low + unit * span
+
+def evaluate_points(points):
+    """
+    Returns (total cost in USD, carbon reduction in tons) for each point:
+    the investment plus its upkeep over the timeframe, and the tons avoided
+    per year over that timeframe.
+    """
+    investment, efficiency, years = points[:, 0], points[:, 1], points[:, 2]
+    cost = investment * (1 + MAINTENANCE_RATE * years)
+    reduction = investment / 1000 * efficiency * years
+    return cost, reduction
+
+def pareto_front(cost, reduction):
+    """
+    Returns a mask of the points no other point beats on both lower cost and
+    higher reduction, found with one sort and a running maximum.
+    """
+    order = np.lexsort((-reduction, cost))
+    best_before = np.maximum.accumulate(reduction[order])
+    best_before = np.concatenate(([-np.inf], best_before[:-1]))
+    mask = np.zeros(len(cost), dtype=bool)
+    mask[order[reduction[order] > best_before]] = True
+    return mask
+
+def run_sweep(definition):
+    """
+    Evaluates a sweep and returns one row per point with Investment_USD,
+    Efficiency, Years, Cost_USD, Carbon_Reduction_tons and Pareto columns.
+    The evaluation is a few elementwise array operations, so it runs
+    in-process. Results are cached per definition, least recently used
+    first out.
+    """
+    cached = _SWEEPS.get(definition)
+    if cached is not None:
+        return cached
+
+    points = sample_points(definition)
+    cost, reduction = evaluate_points(points)
+    sweep = pd.DataFrame({
+        "Investment_USD": points[:, 0],
+        "Efficiency": points[:, 1],
+        "Years": points[:, 2],
+        "Cost_USD": cost,
+        "Carbon_Reduction_tons": reduction,
+        "Pareto": pareto_front(cost, reduction),
+    })
+    _SWEEPS.put(definition, sweep)
+    return sweep
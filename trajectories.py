@@ -0,0 +1,62 @@
+# utils/trajectories.py
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+@dataclass(frozen=True)
+class Trajectories:
+    """
+    Year-by-year emissions paths from a base year to a target year.
+
+    years runs from the base year to the target year inclusive; linear,
+    compound and trend are (categories x years) arrays in tons. summary has
+    one row per category with the required rates and whether the current
+    trend misses the target.
+    """
+    years: np.ndarray
+    linear: np.ndarray
+    compound: np.ndarray
+    trend: np.ndarray
+    summary: pd.DataFrame
+
+def project_trajectories(categories, current, target, trend_rate, base_year=2024, target_year=2030):
+    """
+    Projects every category in one pass over a (categories x years) grid.
+
+    The linear path cuts the same tonnage each year and the compound path
+    the same percentage; both land exactly on target in target_year.
+    trend_rate is the annual reduction the category is achieving today
+    (0.05 = 5%/yr, one value or one per category); the trend path continues
+    it and the category is flagged when that path ends above target.
+    """
+    current = np.asarray(current, dtype=float)
+    target = np.asarray(target, dtype=float)
+    trend_rate = np.broadcast_to(np.asarray(trend_rate, dtype=float), current.shape)
+    horizon = target_year - base_year
+    years = np.arange(base_year, target_year + 1)
+    elapsed = (years - base_year)[np.newaxis, :]
+
+    linear_step = (current - target) / horizon
+    # A zero or negative ratio has no compound rate; fall back to cutting everything
+    ratio = np.where(current > 0, target / np.where(current > 0, current, 1), 0.0)
+    compound_rate = 1 - np.clip(ratio, 0, None) ** (1 / horizon)
+
+    linear = current[:, None] - linear_step[:, None] * elapsed
+    compound = current[:, None] * (1 - compound_rate[:, None]) ** elapsed
+    trend = current[:, None] * (1 - trend_rate[:, None]) ** elapsed
+
+    projected = trend[:, -1]
+    summary = pd.DataFrame({
+        "Category": list(categories),
+        f"Emissions {base_year} (tons CO₂)": current,
+        f"Target {target_year} (tons CO₂)": target,
+        "Required Linear Cut (tons/yr)": linear_step,
+        "Required Compound Cut (%/yr)": compound_rate * 100,
+        "Current Trend (%/yr)": trend_rate * 100,
+        f"Projected {target_year} at Trend (tons CO₂)": projected,
+        "Gap to Target (tons CO₂)": np.maximum(projected - target, 0),
+        "Misses Target": projected > target,
+    })
+    return Trajectories(years=years, linear=linear, compound=compound, trend=trend, summary=summary)
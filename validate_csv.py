@@ -1,17 +1,19 @@
 # validate_csv.py
 
-import pandas as pd
+import argparse
+import csv
+import json
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def validate_csv(file_path):
-    try:
-        df = pd.read_csv(file_path)
-        print(f"Valid CSV: {file_path}")
-        print("Columns:", df.columns.tolist())
-        print(df.head())
-        print("\n")
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
+import numpy as np
+import pandas as pd
+
+from utils.schemas import DATE_FORMAT, get_schema
+
+# Spare columns that catch rows with more fields than the header
+EXTRA_FIELDS = 16
 
 csv_files = [
     "data/esg_tasks.csv",
@@ -26,8 +28,144 @@ csv_files = [
     "data/compliance_tracker.csv"
 ]
 
-for csv in csv_files:
-    if os.path.exists(csv):
-        validate_csv(csv)
-    else:
-        print(f"File not found: {csv}\n")
\ No newline at end of file
+def _error(row, column, rule, value, message):
+    # row is the 1-based data row; the header is line 1, so line = row + 1
+    # (blank lines are kept as rows so the numbering matches the file)
+    return {
+        "row": row,
+        "line": None if row is None else row + 1,
+        "column": column,
+        "rule": rule,
+        "value": None if value is None or pd.isna(value) else str(value),
+        "message": message,
+    }
+
+def _collect(errors, mask, chunk, offset, column, rule, message, max_errors):
+    """
+    Appends one error per flagged row of a chunk, up to max_errors in total.
+    """
+    for position in np.flatnonzero(mask.to_numpy()):
+        if len(errors) >= max_errors:
+            return
+        value = chunk[column].iat[position] if column in chunk.columns else None
+        errors.append(_error(offset + int(position) + 1, column, rule, value, message))
+
+def _check_chunk(chunk, offset, header, schema, errors, max_errors):
+    """
+    Applies the schema's vectorized rules to one chunk of raw string columns.
+    """
+    extras = [c for c in chunk.columns if c not in header]
+    field_counts = len(header) + chunk[extras].notna().sum(axis=1)
+    _collect(errors, field_counts > len(header), chunk, offset, None, "field_count",
+             f"row has more than {len(header)} fields; values are shifted", max_errors)
+
+    if schema is None:
+        return
+
+    for column in schema.numeric:
+        if column not in chunk.columns:
+            continue
+        raw = chunk[column]
+        values = pd.to_numeric(raw, errors="coerce")
+        _collect(errors, raw.notna() & values.isna(), chunk, offset, column, "type",
+                 "expected a number", max_errors)
+        low, high = schema.ranges.get(column, (None, None))
+        if low is not None:
+            _collect(errors, values < low, chunk, offset, column, "range",
+                     f"below minimum {low}", max_errors)
+        if high is not None:
+            _collect(errors, values > high, chunk, offset, column, "range",
+                     f"above maximum {high}", max_errors)
+
+    dates = {}
+    for column in schema.dates:
+        if column not in chunk.columns:
+            continue
+        raw = chunk[column]
+        dates[column] = pd.to_datetime(raw, errors="coerce", format=DATE_FORMAT)
+        _collect(errors, raw.notna() & dates[column].isna(), chunk, offset, column, "type",
+                 f"expected a date formatted {DATE_FORMAT}", max_errors)
+
+    for column, allowed in schema.allowed.items():
+        if column not in chunk.columns:
+            continue
+        raw = chunk[column]
+        _collect(errors, raw.notna() & ~raw.isin(allowed), chunk, offset, column, "allowed",
+                 f"expected one of {', '.join(allowed)}", max_errors)
+
+    for earlier, later in schema.date_order:
+        if earlier in dates and later in dates:
+            _collect(errors, dates[earlier] > dates[later], chunk, offset, later, "date_order",
+                     f"{later} is before {earlier}", max_errors)
+
+def validate_csv(file_path, chunksize=100_000, max_errors=1000, schema_path=None):
+    """
+    Streams a CSV file in chunks and checks it against its schema in
+    utils.schemas. Returns a report with the row number of every error.
+    schema_path checks a file against another dataset's schema, e.g. a
+    feed that is about to be ingested into that dataset.
+    """
+    report = {"file": file_path, "rows": 0, "errors": [], "truncated": False}
+    errors = report["errors"]
+    if not os.path.exists(file_path):
+        errors.append(_error(None, None, "file", None, "file not found"))
+        return report
+
+    schema = get_schema(schema_path or file_path)
+    encoding = schema.encoding if schema else "utf-8-sig"
+    try:
+        with open(file_path, newline="", encoding=encoding) as f:
+            header = next(csv.reader(f), [])
+        if schema is not None:
+            for column in schema.columns:
+                if column not in header:
+                    errors.append(_error(None, column, "header", None, "missing column"))
+            for column in header:
+                if column not in schema.columns:
+                    errors.append(_error(None, column, "header", None, "unexpected column"))
+
+        names = header + [f"__extra_{i}__" for i in range(EXTRA_FIELDS)]
+        reader = pd.read_csv(
+            file_path, encoding=encoding, header=None, skiprows=1, names=names,
+            dtype=str, chunksize=chunksize, skip_blank_lines=False,
+        )
+        for chunk in reader:
+            _check_chunk(chunk, report["rows"], header, schema, errors, max_errors)
+            report["rows"] += len(chunk)
+    except Exception as e:
+        errors.append(_error(None, None, "parse", None, str(e)))
+
+    report["truncated"] = len(errors) >= max_errors
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the data/*.csv files against their schemas.")
+    parser.add_argument("files", nargs="*", default=csv_files, help="CSV files to check (default: all datasets)")
+    parser.add_argument("--report", default="validation_report.json", help="where to write the JSON error report")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows read per chunk")
+    parser.add_argument("--max-errors", type=int, default=1000, help="errors kept per file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or min(len(args.files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max(workers, 1)) as pool:
+        reports = list(pool.map(
+            validate_csv, args.files,
+            [args.chunksize] * len(args.files), [args.max_errors] * len(args.files),
+        ))
+
+    error_count = sum(len(r["errors"]) for r in reports)
+    for r in reports:
+        status = "OK" if not r["errors"] else f"{len(r['errors'])} error(s)"
+        print(f"{r['file']}: {r['rows']} rows, {status}")
+        for e in r["errors"][:5]:
+            where = f"line {e['line']}" if e["line"] else "file"
+            print(f"  {where}, {e['column'] or '-'}: {e['message']} (got {e['value']!r})")
+
+    with open(args.report, "w") as f:
+        json.dump({"error_count": error_count, "files": reports}, f, indent=2)
+    print(f"\nWrote {args.report}: {error_count} error(s) in {len(reports)} file(s).")
+    return 1 if error_count else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
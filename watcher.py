@@ -0,0 +1,105 @@
+# utils/watcher.py
+
+import os
+import threading
+
+import streamlit as st
+
+from utils.helpers import dataset_fingerprint, load_csv
+from utils.schemas import get_schema
+
+DATA_DIR = "data"
+POLL_INTERVAL_SECONDS = 2.0
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+class DatasetWatcher(threading.Thread):
+    """
+    Background thread that polls a data directory and reloads every changed
+    CSV into the shared dataset cache exactly once.
+    """
+
+    def __init__(self, directory=DATA_DIR, interval=POLL_INTERVAL_SECONDS):
+        super().__init__(name="dataset-watcher", daemon=True)
+        self.directory = directory
+        self.interval = interval
+        self._stats = {}
+        self._stop_event = threading.Event()
+
+    def scan(self):
+        """
+        Reloads the CSV files whose mtime or size changed since the last scan.
+        Only datasets registered in utils.schemas are watched, and streamed
+        ones such as the loan book are left to their own modules. Returns
+        the paths that were reloaded.
+        """
+        changed = []
+        seen = set()
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return changed
+        for entry in entries:
+            schema = get_schema(entry.path)
+            if not entry.name.endswith(".csv") or schema is None or schema.streamed:
+                continue
+            stat = entry.stat()
+            seen.add(entry.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._stats.get(entry.path) != signature:
+                self._stats[entry.path] = signature
+                # load_csv parses off to the side and swaps the cache entry in one step
+                load_csv(entry.path)
+                changed.append(entry.path)
+        for path in set(self._stats) - seen:
+            del self._stats[path]
+        return changed
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"Dataset watcher error: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+def start_watcher(directory=DATA_DIR, interval=POLL_INTERVAL_SECONDS):
+    """
+    Starts the process-wide dataset watcher if it is not running yet.
+    Safe to call on every rerun of every session.
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = DatasetWatcher(directory, interval)
+            # Prime the stat table (and warm the cache) so the first scan is not a change.
+            _watcher.scan()
+            _watcher.start()
+    return _watcher
+
+def _content_hash(file_path):
+    # A touched but unchanged file keeps its hash, so it does not trigger reruns.
+    fingerprint = dataset_fingerprint(file_path)
+    return fingerprint[2] if fingerprint else None
+
+def watch_datasets(*file_paths, interval=POLL_INTERVAL_SECONDS):
+    """
+    Reruns the current session when one of the given datasets is swapped in
+    the shared cache. Only sessions showing a page that depends on a changed
+    file rerun; the check itself is a dictionary lookup per file.
+    """
+    keys = {path: f"_dataset_version::{os.path.abspath(path)}" for path in file_paths}
+    for path, key in keys.items():
+        st.session_state[key] = _content_hash(path)
+
+    @st.fragment(run_every=interval)
+    def _check_for_updates():
+        for path, key in keys.items():
+            if _content_hash(path) != st.session_state.get(key):
+                st.rerun()
+
+    _check_for_updates()